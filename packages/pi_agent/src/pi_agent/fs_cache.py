@@ -0,0 +1,59 @@
+"""Short-lived stat() cache shared by the built-in file tools.
+
+Coding agents touch the same files over and over (read -> edit -> read), and
+each existence / type probe is a stat() syscall. Successful stat results are
+kept for a few seconds; misses are never cached so newly created files are
+seen immediately. Tools that write a file invalidate its entry.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 2.0
+MAX_ENTRIES = 512
+
+_cache: OrderedDict[str, tuple[float, os.stat_result]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def cached_stat(path: str, ttl: float = DEFAULT_TTL) -> os.stat_result | None:
+    """
+    Return ``os.stat(path)``, reusing a result younger than ``ttl`` seconds.
+
+    Returns None if the path does not exist or cannot be stat'ed.
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and now - entry[0] < ttl:
+            _cache.move_to_end(path)
+            return entry[1]
+
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        invalidate_stat(path)
+        return None
+
+    with _lock:
+        _cache[path] = (now, st)
+        _cache.move_to_end(path)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return st
+
+
+def invalidate_stat(path: str) -> None:
+    """Drop any cached stat result for ``path``."""
+    with _lock:
+        _cache.pop(path, None)
+
+
+def clear_stat_cache() -> None:
+    """Drop all cached stat results."""
+    with _lock:
+        _cache.clear()
@@ -3,7 +3,14 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import contextlib
+import mmap
+import os
+import signal
+import stat
+import tempfile
+import threading
+from typing import Any, AnyStr
 
 try:
     import jsonschema
@@ -17,12 +24,17 @@ except ImportError:
 
 from pi_ai.types import TextContent
 
+from .fs_cache import cached_stat, invalidate_stat
 from .types import AgentTool, AgentToolResult, AgentToolUpdateCallback
 
 # Expose the flag for external use
 HAS_JSONSCHEMA = _has_jsonschema
 
 
+def _text(text: str) -> TextContent:
+    return TextContent(type="text", text=text)
+
+
 class ToolValidationError(Exception):
     """Raised when tool parameter validation fails."""
 
@@ -56,6 +68,21 @@ def validate_tool_params(
     return errors
 
 
+def _compile_validator(schema: dict[str, Any]) -> Any | None:
+    """Build a reusable jsonschema validator for ``schema`` (None without jsonschema)."""
+    if not _has_jsonschema:
+        return None
+
+    validator_cls = jsonschema.validators.validator_for(schema)
+    return validator_cls(schema)
+
+
+def _run_validator(validator: Any, params: dict[str, Any]) -> list[str]:
+    """Validate ``params`` with a prebuilt validator, reporting the best error like validate()."""
+    error = jsonschema.exceptions.best_match(validator.iter_errors(params))
+    return [str(error)] if error is not None else []
+
+
 def validate_tool_call(
     tool: AgentTool,
     args: dict[str, Any],
@@ -92,6 +119,9 @@ def create_tool(
         AgentTool instance
     """
 
+    # Build the validator once instead of re-processing the schema on every call
+    validator = _compile_validator(parameters) if parameters else None
+
     async def validated_execute(
         tool_call_id: str,
         args: dict[str, Any],
@@ -99,15 +129,11 @@ def create_tool(
         on_update: AgentToolUpdateCallback | None,
     ) -> AgentToolResult:
         # Validate parameters
-        if parameters:
-            errors = validate_tool_params(parameters, args)
+        if validator is not None:
+            errors = _run_validator(validator, args)
             if errors:
                 return AgentToolResult(
-                    content=[
-                        TextContent(
-                            type="text", text=f"Parameter validation failed: {', '.join(errors)}"
-                        )
-                    ],
+                    content=[_text(f"Parameter validation failed: {', '.join(errors)}")],
                     details={"validation_errors": errors},
                 )
 
@@ -127,6 +153,162 @@ def create_tool(
 # ============================================================================
 
 
+def _read_text(file_path: str) -> str:
+    with open(file_path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _read_for_edit(file_path: str, as_bytes: bool) -> str | bytes:
+    """
+    Read ``file_path`` for editing, as raw bytes when ``as_bytes`` is set.
+
+    ASCII needles can be matched and replaced on UTF-8 bytes directly, skipping
+    a decode of the whole file and an encode of the result. Files containing
+    ``\r`` are still decoded, since text mode translates their line endings.
+    """
+    if not as_bytes:
+        return _read_text(file_path)
+    with open(file_path, "rb") as f:
+        data = f.read()
+    if b"\r" in data:
+        return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    return data
+
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _read_head(file_path: str, limit: int) -> tuple[str, int, bool]:
+    """Read at most ``limit`` lines, stopping as soon as the limit is hit.
+
+    Newlines are located in the raw bytes (``bytes.find`` is a memchr scan) and
+    only the returned prefix is decoded.
+
+    Returns the text, the number of lines read and whether more lines follow.
+    """
+    with open(file_path, "rb") as f:
+        data = bytearray()
+        pos = 0
+        lines = 0
+        while lines < limit:
+            newline = data.find(b"\n", pos)
+            if newline < 0:
+                chunk = f.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                data += chunk
+                continue
+            lines += 1
+            pos = newline + 1
+
+        if lines == limit:
+            head = data[:pos]
+            has_more = len(data) > pos or f.read(1) != b""
+        else:
+            # Hit end of file first; a trailing partial line still counts
+            head = data
+            lines += 1 if len(data) > pos else 0
+            has_more = False
+
+    text = head.decode("utf-8").replace("\r\n", "\n")
+    return text, lines, has_more
+
+
+# Files at least this large are probed with mmap before being decoded
+_MMAP_PROBE_THRESHOLD = 1024 * 1024
+
+
+def _file_contains(file_path: str, needle: str) -> bool:
+    """Search the raw bytes of ``file_path`` for ``needle`` without decoding it."""
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm.find(needle.encode("utf-8")) >= 0
+
+
+# Process umask, read once at the first write: mkstemp creates files as 0600,
+# so new files are given the mode open() would have used
+_umask: int | None = None
+_umask_lock = threading.Lock()
+
+
+def _read_umask() -> int:
+    """Read the process umask, preferring Linux's /proc over os.umask().
+
+    os.umask() can only read the mask by replacing it, which briefly applies a
+    umask of 0 to every thread in the process.
+    """
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _process_umask() -> int:
+    global _umask
+    if _umask is None:
+        with _umask_lock:
+            if _umask is None:
+                _umask = _read_umask()
+    return _umask
+
+
+def _write_text(file_path: str, content: str | bytes) -> None:
+    """
+    Atomically replace ``file_path`` with ``content``.
+
+    The data is written to a uniquely named temporary file next to the target
+    (``mkstemp``, so it is created exclusively) and renamed over it, so readers
+    never observe a half-written file. Symlinks are followed and the mode of an
+    existing target is preserved.
+
+    The rename gives the target a new inode: its owner, group and extended
+    attributes are not carried over. A target with more than one hard link is
+    written in place instead, so every link sees the new content.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    target = os.path.realpath(file_path)
+    try:
+        try:
+            st: os.stat_result | None = os.stat(target)
+        except FileNotFoundError:
+            st = None
+        if st is not None and st.st_nlink > 1:
+            with open(target, "wb") as f:
+                f.write(data)
+            return
+
+        directory, name = os.path.split(target)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            mode = stat.S_IMODE(st.st_mode) if st is not None else 0o666 & ~_process_umask()
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, target)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+    finally:
+        invalidate_stat(file_path)
+
+
+def _not_a_file(file_path: str) -> AgentToolResult | None:
+    """Return an error result if ``file_path`` exists but is not a regular file."""
+    st = cached_stat(file_path)
+    if st is not None and not stat.S_ISREG(st.st_mode):
+        return AgentToolResult(
+            content=[_text(f"Error: Not a file: {file_path}")],
+            details={"error": "not_a_file", "file_path": file_path},
+        )
+    return None
+
+
 async def _execute_read_file(
     tool_call_id: str,
     args: dict[str, Any],
@@ -135,23 +317,44 @@ async def _execute_read_file(
 ) -> AgentToolResult:
     """Execute read_file tool."""
     file_path = args.get("file_path", "")
+    limit = args.get("limit")
+
+    not_a_file = _not_a_file(file_path)
+    if not_a_file:
+        return not_a_file
 
     try:
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
+        if limit is not None:
+            limit = max(0, int(limit))
+            content, lines_read, has_more = await asyncio.to_thread(_read_head, file_path, limit)
+            text = content
+            if has_more:
+                text += f"\n[Showing first {lines_read} lines. File has more content.]"
+            return AgentToolResult(
+                content=[_text(text)],
+                details={
+                    "file_path": file_path,
+                    "size": len(content),
+                    "lines": lines_read,
+                    "truncated": has_more,
+                },
+            )
+
+        # Run blocking file I/O off the event loop so concurrent tool calls proceed
+        content = await asyncio.to_thread(_read_text, file_path)
 
         return AgentToolResult(
-            content=[TextContent(type="text", text=content)],
+            content=[_text(content)],
             details={"file_path": file_path, "size": len(content)},
         )
     except FileNotFoundError:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"File not found: {file_path}")],
+            content=[_text(f"File not found: {file_path}")],
             details={"error": "file_not_found", "file_path": file_path},
         )
     except Exception as e:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"Error reading file: {e}")],
+            content=[_text(f"Error reading file: {e}")],
             details={"error": str(e), "file_path": file_path},
         )
 
@@ -167,24 +370,94 @@ async def _execute_write_file(
     content = args.get("content", "")
 
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        await asyncio.to_thread(_write_text, file_path, content)
 
         return AgentToolResult(
-            content=[
-                TextContent(
-                    type="text", text=f"Successfully wrote {len(content)} bytes to {file_path}"
-                )
-            ],
+            content=[_text(f"Successfully wrote {len(content)} bytes to {file_path}")],
             details={"file_path": file_path, "bytes_written": len(content)},
         )
     except Exception as e:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"Error writing file: {e}")],
+            content=[_text(f"Error writing file: {e}")],
             details={"error": str(e), "file_path": file_path},
         )
 
 
+# Cap on captured output per stream; the first and last halves are kept
+MAX_OUTPUT_BYTES = 256 * 1024
+
+# grep output is read in chunks rather than lines: StreamReader.readline()
+# fails on lines longer than its 64 KiB buffer (minified or generated files)
+GREP_READ_CHUNK = 64 * 1024
+
+
+def _line_end(data: bytes | bytearray, n: int) -> int:
+    """Return the offset just past the n-th newline in ``data``, or -1."""
+    pos = -1
+    for _ in range(n):
+        pos = data.find(b"\n", pos + 1)
+        if pos == -1:
+            return -1
+    return pos + 1
+
+
+class _BoundedOutput:
+    """Collects a byte stream, keeping only its head and tail in memory."""
+
+    def __init__(self, limit: int = MAX_OUTPUT_BYTES):
+        self.head_limit = limit // 2
+        self.tail_limit = limit - self.head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+
+    def write(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data:
+            self.tail += data
+            if len(self.tail) > self.tail_limit:
+                del self.tail[: len(self.tail) - self.tail_limit]
+
+    @property
+    def truncated_bytes(self) -> int:
+        return self.total_bytes - len(self.head) - len(self.tail)
+
+    def text(self) -> str:
+        text = self.head.decode("utf-8", errors="replace")
+        if self.truncated_bytes > 0:
+            text += f"\n... [truncated {self.truncated_bytes} bytes] ...\n"
+        return text + self.tail.decode("utf-8", errors="replace")
+
+
+async def _pump(reader: asyncio.StreamReader | None, output: _BoundedOutput) -> None:
+    if reader is None:
+        return
+    while chunk := await reader.read(65536):
+        output.write(chunk)
+
+
+def _kill_process_tree(process: asyncio.subprocess.Process) -> None:
+    """Kill a shell and everything it spawned.
+
+    Killing only the shell would leave its children holding the output pipes
+    open, so on POSIX the whole process group (see ``start_new_session``) is killed.
+    """
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
+            return
+        except OSError:
+            pass
+    if process.returncode is None:
+        process.kill()
+
+
 async def _execute_bash(
     tool_call_id: str,
     args: dict[str, Any],
@@ -203,35 +476,67 @@ async def _execute_bash(
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=cwd,
+            start_new_session=os.name == "posix",
+        )
+
+        stdout = _BoundedOutput()
+        stderr = _BoundedOutput()
+        communicate = asyncio.ensure_future(
+            asyncio.gather(
+                _pump(process.stdout, stdout), _pump(process.stderr, stderr), process.wait()
+            )
         )
+        waiters: set[asyncio.Future[Any]] = {communicate}
+        cancel_wait = None
+        if cancel_event is not None:
+            # Watch the cancel event alongside the process so the command can be aborted
+            cancel_wait = asyncio.ensure_future(cancel_event.wait())
+            waiters.add(cancel_wait)
 
         try:
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
-        except TimeoutError:
-            process.kill()
+            done, _ = await asyncio.wait(
+                waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            if cancel_wait is not None:
+                cancel_wait.cancel()
+
+        if communicate not in done:
+            communicate.cancel()
+            _kill_process_tree(process)
+            await process.wait()
+
+            if cancel_event is not None and cancel_event.is_set():
+                return AgentToolResult(
+                    content=[_text("Command aborted")],
+                    details={"error": "aborted"},
+                )
             return AgentToolResult(
-                content=[TextContent(type="text", text=f"Command timed out after {timeout}s")],
+                content=[_text(f"Command timed out after {timeout}s")],
                 details={"error": "timeout", "timeout": timeout},
             )
 
-        output = stdout.decode("utf-8", errors="replace")
-        error_output = stderr.decode("utf-8", errors="replace")
+        output = stdout.text()
+        error_output = stderr.text()
 
         result_text = output
         if error_output:
             result_text += f"\n[stderr]\n{error_output}"
 
         return AgentToolResult(
-            content=[TextContent(type="text", text=result_text)],
+            content=[_text(result_text)],
             details={
                 "exit_code": process.returncode,
                 "stdout_length": len(output),
                 "stderr_length": len(error_output),
+                "stdout_bytes": stdout.total_bytes,
+                "stderr_bytes": stderr.total_bytes,
+                "truncated": stdout.truncated_bytes > 0 or stderr.truncated_bytes > 0,
             },
         )
     except Exception as e:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"Error executing command: {e}")],
+            content=[_text(f"Error executing command: {e}")],
             details={"error": str(e)},
         )
 
@@ -247,6 +552,7 @@ async def _execute_grep(
     pattern = args.get("pattern", "")
     path = args.get("path", ".")
     ignore_case = args.get("ignore_case", False)
+    limit = args.get("limit")
 
     cmd = ["grep", "-r", "-n"]
     if ignore_case:
@@ -254,23 +560,60 @@ async def _execute_grep(
     cmd.extend([pattern, path])
 
     try:
+        limit = None if limit is None else max(1, int(limit))
+
+        # Nobody reads stderr; a pipe could fill up and stall grep
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
+        assert process.stdout is not None
 
-        stdout, stderr = await process.communicate()
-
-        output = stdout.decode("utf-8", errors="replace")
+        # Stream matches and, given a limit, stop grep once it is reached
+        # rather than collecting every match in the tree
+        output_bytes = bytearray()
+        newlines = 0
+        truncated = False
+        try:
+            while chunk := await process.stdout.read(GREP_READ_CHUNK):
+                output_bytes += chunk
+                newlines += chunk.count(b"\n")
+                if limit is not None and newlines >= limit:
+                    end = _line_end(output_bytes, limit)
+                    truncated = end < len(output_bytes) or bool(await process.stdout.read(1))
+                    del output_bytes[end:]
+                    if truncated:
+                        break
+            if not truncated:
+                await process.wait()
+        finally:
+            # Stopped early or failed: don't leave grep running or unreaped
+            if process.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+
+        output = output_bytes.decode("utf-8", errors="replace")
+        matches = output_bytes.count(b"\n")
+        if output_bytes and not output_bytes.endswith(b"\n"):
+            matches += 1
+        if truncated:
+            output += f"\n[Showing first {limit} matches. Refine the pattern or raise limit.]"
 
         return AgentToolResult(
-            content=[TextContent(type="text", text=output or "No matches found")],
-            details={"pattern": pattern, "path": path, "exit_code": process.returncode},
+            content=[_text(output or "No matches found")],
+            details={
+                "pattern": pattern,
+                "path": path,
+                "exit_code": None if truncated else process.returncode,
+                "matches": matches,
+                "truncated": truncated,
+            },
         )
     except Exception as e:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"Error executing grep: {e}")],
+            content=[_text(f"Error executing grep: {e}")],
             details={"error": str(e)},
         )
 
@@ -283,6 +626,10 @@ READ_FILE_SCHEMA = {
             "type": "string",
             "description": "The path to the file to read",
         },
+        "limit": {
+            "type": "number",
+            "description": "Maximum number of lines to read (default: entire file)",
+        },
     },
     "required": ["file_path"],
 }
@@ -339,6 +686,10 @@ GREP_SCHEMA = {
             "description": "Whether to ignore case (default: false)",
             "default": False,
         },
+        "limit": {
+            "type": "number",
+            "description": "Maximum matching lines to return (default: no limit)",
+        },
     },
     "required": ["pattern"],
 }
@@ -404,6 +755,53 @@ def get_builtin_tools() -> list[AgentTool]:
 # ============================================================================
 
 
+def _replace_counted(
+    content: AnyStr,
+    old: AnyStr,
+    new: AnyStr,
+    replace_all: bool,
+) -> tuple[AnyStr | None, int]:
+    """
+    Replace ``old`` with ``new`` while scanning the content as few times as possible.
+
+    Returns the new content and the number of occurrences of ``old``. When
+    ``replace_all`` is false and ``old`` occurs more than once, no replacement is
+    made and the content is None.
+    """
+    if replace_all:
+        new_content = content.replace(old, new)
+        delta = len(new) - len(old)
+        if delta:
+            # The length change tells us how many replacements happened
+            return new_content, (len(new_content) - len(content)) // delta
+        return new_content, content.count(old)
+
+    index = content.find(old)
+    if index < 0:
+        return content, 0
+    if content.find(old, index + len(old)) >= 0:
+        return None, content.count(old)
+    return content[:index] + new + content[index + len(old) :], 1
+
+
+def _edit_label(edits: list[dict[str, Any]], index: int) -> str:
+    return f"edits[{index}].old_string" if len(edits) > 1 else "old_string"
+
+
+def _old_string_not_found(
+    file_path: str, edits: list[dict[str, Any]], index: int
+) -> AgentToolResult:
+    return AgentToolResult(
+        content=[_text(f"Error: {_edit_label(edits, index)} not found in {file_path}")],
+        details={
+            "error": "old_string_not_found",
+            "file_path": file_path,
+            "old_string_length": len(edits[index]["old_string"]),
+            "edit_index": index,
+        },
+    )
+
+
 async def _execute_edit_file(
     tool_call_id: str,
     args: dict[str, Any],
@@ -416,97 +814,133 @@ async def _execute_edit_file(
     The old_string must exist exactly as provided for the edit to succeed.
     """
     file_path = args.get("file_path", "")
-    old_string = args.get("old_string", "")
-    new_string = args.get("new_string", "")
-    replace_all = args.get("replace_all", False)
+    edits = args.get("edits")
+    if not edits:
+        edits = [
+            {
+                "old_string": args.get("old_string", ""),
+                "new_string": args.get("new_string", ""),
+                "replace_all": args.get("replace_all", False),
+            }
+        ]
 
     # Validate required parameters
     if not file_path:
         return AgentToolResult(
-            content=[TextContent(type="text", text="Error: file_path is required")],
+            content=[_text("Error: file_path is required")],
             details={"error": "missing_file_path"},
         )
 
-    if not old_string:
+    if not all(edit.get("old_string") for edit in edits):
         return AgentToolResult(
-            content=[TextContent(type="text", text="Error: old_string is required")],
+            content=[_text("Error: old_string is required")],
             details={"error": "missing_old_string"},
         )
 
-    try:
-        # Read the file
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
+    if not args.get("edits") and "new_string" not in args:
+        return AgentToolResult(
+            content=[_text("Error: new_string is required")],
+            details={"error": "missing_new_string"},
+        )
 
-        # Count occurrences
-        occurrences = content.count(old_string)
+    not_a_file = _not_a_file(file_path)
+    if not_a_file:
+        return not_a_file
 
-        if occurrences == 0:
-            return AgentToolResult(
-                content=[
-                    TextContent(type="text", text=f"Error: old_string not found in {file_path}")
-                ],
-                details={
-                    "error": "old_string_not_found",
-                    "file_path": file_path,
-                    "old_string_length": len(old_string),
-                },
+    try:
+        # For large files, rule out a missing first old_string on the raw bytes
+        # before paying for a full decode. Needles with newline characters are
+        # skipped since text mode translates \r\n on read.
+        first_old = edits[0]["old_string"]
+        st = cached_stat(file_path)
+        if (
+            st is not None
+            and st.st_size >= _MMAP_PROBE_THRESHOLD
+            and "\n" not in first_old
+            and "\r" not in first_old
+            and not await asyncio.to_thread(_file_contains, file_path, first_old)
+        ):
+            return _old_string_not_found(file_path, edits, 0)
+
+        as_bytes = all(
+            edit["old_string"].isascii() and edit.get("new_string", "").isascii() for edit in edits
+        )
+        content = await asyncio.to_thread(_read_for_edit, file_path, as_bytes)
+
+        # Edits apply in order to the result of the previous one; the file is
+        # only written once, after every edit has matched.
+        new_content = content
+        replacements = 0
+        for index, edit in enumerate(edits):
+            old_string = edit["old_string"]
+            new_string = edit.get("new_string", "")
+            if isinstance(content, bytes):
+                old_string, new_string = old_string.encode(), new_string.encode()
+            replaced, occurrences = _replace_counted(
+                new_content,
+                old_string,
+                new_string,
+                edit.get("replace_all", False),
             )
 
-        # Perform replacement
-        if replace_all:
-            new_content = content.replace(old_string, new_string)
-            replacements = occurrences
-        else:
-            if occurrences > 1:
+            if occurrences == 0:
+                return _old_string_not_found(file_path, edits, index)
+
+            if replaced is None:
                 return AgentToolResult(
                     content=[
-                        TextContent(
-                            type="text",
-                            text=f"Error: old_string found {occurrences} times in {file_path}. Use replace_all=true to replace all occurrences, or provide a more specific old_string.",
+                        _text(
+                            f"Error: {_edit_label(edits, index)} found {occurrences} times in {file_path}. Use replace_all=true to replace all occurrences, or provide a more specific old_string."
                         )
                     ],
                     details={
                         "error": "multiple_matches",
                         "file_path": file_path,
                         "occurrences": occurrences,
+                        "edit_index": index,
                     },
                 )
-            new_content = content.replace(old_string, new_string, 1)
-            replacements = 1
 
-        # Write back
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
+            new_content = replaced
+            replacements += occurrences
+
+        # Leave the file (and its mtime) untouched when nothing would change
+        if new_content == content:
+            return AgentToolResult(
+                content=[
+                    _text(f"No changes made to {file_path}: replacement produced identical content")
+                ],
+                details={"file_path": file_path, "status": "unchanged", "replacements": 0},
+            )
+
+        await asyncio.to_thread(_write_text, file_path, new_content)
 
         return AgentToolResult(
             content=[
-                TextContent(
-                    type="text",
-                    text=f"Successfully edited {file_path}: replaced {replacements} occurrence(s)",
-                )
+                _text(f"Successfully edited {file_path}: replaced {replacements} occurrence(s)")
             ],
             details={
                 "file_path": file_path,
                 "replacements": replacements,
-                "old_length": len(old_string),
-                "new_length": len(new_string),
+                "edits": len(edits),
+                "old_length": sum(len(edit["old_string"]) for edit in edits),
+                "new_length": sum(len(edit.get("new_string", "")) for edit in edits),
             },
         )
 
     except FileNotFoundError:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"Error: File not found: {file_path}")],
+            content=[_text(f"Error: File not found: {file_path}")],
             details={"error": "file_not_found", "file_path": file_path},
         )
     except PermissionError:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"Error: Permission denied: {file_path}")],
+            content=[_text(f"Error: Permission denied: {file_path}")],
             details={"error": "permission_denied", "file_path": file_path},
         )
     except Exception as e:
         return AgentToolResult(
-            content=[TextContent(type="text", text=f"Error editing file: {e}")],
+            content=[_text(f"Error editing file: {e}")],
             details={"error": str(e), "file_path": file_path},
         )
 
@@ -531,8 +965,21 @@ EDIT_FILE_SCHEMA = {
             "description": "If true, replace all occurrences. If false (default), only replace the first occurrence and error if multiple matches found.",
             "default": False,
         },
+        "edits": {
+            "type": "array",
+            "description": "Apply several replacements to the same file in one call, in order. When given, old_string/new_string/replace_all are ignored. Nothing is written unless every edit matches.",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "old_string": {"type": "string"},
+                    "new_string": {"type": "string"},
+                    "replace_all": {"type": "boolean", "default": False},
+                },
+                "required": ["old_string", "new_string"],
+            },
+        },
     },
-    "required": ["file_path", "old_string", "new_string"],
+    "required": ["file_path"],
 }
 
 
@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+from pi_agent.fs_cache import cached_stat, clear_stat_cache, invalidate_stat
+
+
+class TestCachedStat:
+    def setup_method(self):
+        clear_stat_cache()
+
+    def test_missing_path_returns_none(self):
+        assert cached_stat("/nonexistent/path/file.txt") is None
+
+    def test_missing_path_is_not_cached(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "later.txt")
+            assert cached_stat(path) is None
+
+            with open(path, "w") as f:
+                f.write("now it exists")
+
+            assert cached_stat(path) is not None
+
+    def test_hit_reuses_result_until_invalidated(self):
+        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+            f.write("abc")
+            path = f.name
+
+        try:
+            first = cached_stat(path)
+            assert first is not None and first.st_size == 3
+
+            with open(path, "w") as f:
+                f.write("abcdef")
+
+            assert cached_stat(path) is first
+
+            invalidate_stat(path)
+            refreshed = cached_stat(path)
+            assert refreshed is not None and refreshed.st_size == 6
+        finally:
+            os.unlink(path)
+
+    def test_zero_ttl_always_restats(self):
+        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+            path = f.name
+
+        try:
+            first = cached_stat(path)
+            assert cached_stat(path, ttl=0) is not first
+        finally:
+            os.unlink(path)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import tempfile
 
@@ -94,6 +95,10 @@ class TestCreateTool:
         result = await tool.execute("call-1", {"required_field": "value"}, None, None)
         assert "Success" in result.content[0].text  # type: ignore[union-attr]
 
+        result = await tool.execute("call-2", {}, None, None)
+        assert "Parameter validation failed" in result.content[0].text  # type: ignore[union-attr]
+        assert "required_field" in result.details["validation_errors"][0]
+
 
 class TestBuiltinTools:
     def test_get_builtin_tools(self):
@@ -157,6 +162,95 @@ class TestToolExecution:
 
         assert "Hello World" in result.content[0].text  # type: ignore[union-attr]
 
+    @pytest.mark.asyncio
+    async def test_bash_tool_large_output_keeps_head_and_tail(self):
+        tool = create_bash_tool()
+
+        result = await tool.execute(
+            "call-1",
+            {"command": "printf START; head -c 1000000 /dev/zero | tr '\\0' x; printf END"},
+            None,
+            None,
+        )
+
+        text = result.content[0].text  # type: ignore[union-attr]
+        assert text.startswith("START")
+        assert text.endswith("END")
+        assert "truncated" in text
+        assert result.details.get("stdout_bytes") == 1000008
+        assert result.details.get("truncated") is True
+        assert len(text) < 300 * 1024
+
+    @pytest.mark.asyncio
+    async def test_bash_tool_timeout(self):
+        tool = create_bash_tool()
+
+        result = await tool.execute("call-1", {"command": "sleep 5", "timeout": 0.1}, None, None)
+
+        assert result.details.get("error") == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_bash_tool_cancel_event_aborts(self):
+        tool = create_bash_tool()
+        cancel_event = asyncio.Event()
+
+        task = asyncio.create_task(
+            tool.execute("call-1", {"command": "sleep 5"}, cancel_event, None)
+        )
+        await asyncio.sleep(0.1)
+        cancel_event.set()
+        result = await asyncio.wait_for(task, timeout=2)
+
+        assert result.details.get("error") == "aborted"
+
+    @pytest.mark.asyncio
+    async def test_grep_stops_at_limit(self):
+        tool = create_grep_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "a.txt"), "w") as f:
+                f.writelines(f"match {i}\n" for i in range(1000))
+
+            result = await tool.execute(
+                "call-1", {"pattern": "match", "path": tmp, "limit": 5}, None, None
+            )
+
+        text = result.content[0].text  # type: ignore[union-attr]
+        assert text.count("a.txt:") == 5
+        assert "[Showing first 5 matches" in text
+        assert result.details.get("truncated") is True
+        assert result.details.get("matches") == 5
+
+    @pytest.mark.asyncio
+    async def test_grep_invalid_limit_returns_error_result(self):
+        tool = create_grep_tool()
+
+        result = await tool.execute(
+            "call-1", {"pattern": "match", "path": ".", "limit": float("inf")}, None, None
+        )
+
+        assert "Error executing grep" in result.content[0].text  # type: ignore[union-attr]
+        assert "error" in result.details
+
+    @pytest.mark.asyncio
+    async def test_grep_handles_long_lines(self):
+        tool = create_grep_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Longer than asyncio's 64 KiB readline buffer
+            long_line = "match " + "x" * (200 * 1024)
+            with open(os.path.join(tmp, "min.js"), "w") as f:
+                f.write(long_line + "\nmatch again\n")
+
+            result = await tool.execute("call-1", {"pattern": "match", "path": tmp}, None, None)
+
+        text = result.content[0].text  # type: ignore[union-attr]
+        assert long_line in text
+        assert "match again" in text
+        assert result.details.get("truncated") is False
+        assert result.details.get("matches") == 2
+        assert result.details.get("exit_code") == 0
+
     @pytest.mark.asyncio
     async def test_read_file_not_found(self):
         tool = create_read_file_tool()
@@ -173,6 +267,134 @@ class TestToolExecution:
             or "error" in result.content[0].text  # type: ignore[union-attr].lower()
         )
 
+    @pytest.mark.asyncio
+    async def test_write_then_read_file(self):
+        write_tool = create_write_file_tool()
+        read_tool = create_read_file_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "roundtrip.txt")
+
+            write_result = await write_tool.execute(
+                "call-1",
+                {"file_path": file_path, "content": "line one\nline two\n"},
+                None,
+                None,
+            )
+            assert write_result.details.get("bytes_written") == 18
+
+            read_result = await read_tool.execute("call-2", {"file_path": file_path}, None, None)
+            assert read_result.content[0].text == "line one\nline two\n"  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_write_file_replaces_atomically(self):
+        tool = create_write_file_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "script.sh")
+            with open(file_path, "w") as f:
+                f.write("old contents\n")
+            os.chmod(file_path, 0o750)
+
+            await tool.execute(
+                "call-1", {"file_path": file_path, "content": "new contents\n"}, None, None
+            )
+
+            with open(file_path) as f:
+                assert f.read() == "new contents\n"
+            assert os.stat(file_path).st_mode & 0o777 == 0o750
+            assert os.listdir(tmp) == ["script.sh"]
+
+    @pytest.mark.asyncio
+    async def test_write_file_new_file_uses_umask_mode(self):
+        tool = create_write_file_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "new.txt")
+            await tool.execute("call-1", {"file_path": file_path, "content": "x"}, None, None)
+
+            umask = os.umask(0)
+            os.umask(umask)
+            assert os.stat(file_path).st_mode & 0o777 == 0o666 & ~umask
+
+    def test_read_umask_does_not_swap_the_umask_on_linux(self, monkeypatch):
+        from pi_agent import tools
+
+        if not os.path.exists("/proc/self/status"):
+            pytest.skip("no /proc")
+        umask = os.umask(0)
+        os.umask(umask)
+
+        def fail(mask):
+            raise AssertionError("os.umask called")
+
+        monkeypatch.setattr(tools.os, "umask", fail)
+        assert tools._read_umask() == umask
+
+    @pytest.mark.asyncio
+    async def test_write_file_keeps_hard_links(self):
+        tool = create_write_file_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "a.txt")
+            link_path = os.path.join(tmp, "b.txt")
+            with open(file_path, "w") as f:
+                f.write("old\n")
+            os.link(file_path, link_path)
+
+            await tool.execute("call-1", {"file_path": file_path, "content": "new\n"}, None, None)
+
+            with open(link_path) as f:
+                assert f.read() == "new\n"
+            assert os.stat(file_path).st_ino == os.stat(link_path).st_ino
+
+    @pytest.mark.asyncio
+    async def test_write_file_concurrent_writes_do_not_collide(self):
+        tool = create_write_file_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "shared.txt")
+            contents = [f"writer {i}\n" * 100 for i in range(20)]
+            results = await asyncio.gather(
+                *(
+                    tool.execute(f"call-{i}", {"file_path": file_path, "content": c}, None, None)
+                    for i, c in enumerate(contents)
+                )
+            )
+
+            assert all("error" not in r.details for r in results)
+            with open(file_path) as f:
+                assert f.read() in contents
+            assert os.listdir(tmp) == ["shared.txt"]
+
+    @pytest.mark.asyncio
+    async def test_read_file_directory_is_not_a_file(self):
+        tool = create_read_file_tool()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            result = await tool.execute("call-1", {"file_path": tmp}, None, None)
+
+        assert result.details.get("error") == "not_a_file"
+
+    @pytest.mark.asyncio
+    async def test_read_file_limit_stops_early(self):
+        tool = create_read_file_tool()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.writelines(f"line {i}\n" for i in range(1, 101))
+            temp_file = f.name
+
+        try:
+            result = await tool.execute("call-1", {"file_path": temp_file, "limit": 3}, None, None)
+
+            text = result.content[0].text  # type: ignore[union-attr]
+            assert text.startswith("line 1\nline 2\nline 3\n")
+            assert "line 4" not in text
+            assert result.details.get("lines") == 3
+            assert result.details.get("truncated") is True
+        finally:
+            os.unlink(temp_file)
+
     @pytest.mark.asyncio
     async def test_edit_file_single_replacement(self):
         """Test edit_file with a single occurrence."""
@@ -204,6 +426,39 @@ class TestToolExecution:
         finally:
             os.unlink(temp_file)
 
+    @pytest.mark.asyncio
+    async def test_read_and_edit_see_same_size_rewrite(self):
+        """An external same-size rewrite that keeps the mtime is seen by read and edit."""
+        read_tool = create_read_file_tool()
+        edit_tool = create_edit_file_tool()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.write("alpha beta\n")
+            temp_file = f.name
+
+        try:
+            await read_tool.execute("call-1", {"file_path": temp_file}, None, None)
+            st = os.stat(temp_file)
+            with open(temp_file, "w") as f:
+                f.write("gamma beta\n")
+            os.utime(temp_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+            read_result = await read_tool.execute("call-2", {"file_path": temp_file}, None, None)
+            assert read_result.content[0].text == "gamma beta\n"  # type: ignore[union-attr]
+
+            result = await edit_tool.execute(
+                "call-3",
+                {"file_path": temp_file, "old_string": "beta", "new_string": "delta"},
+                None,
+                None,
+            )
+
+            assert result.details.get("replacements") == 1
+            with open(temp_file) as f:
+                assert f.read() == "gamma delta\n"
+        finally:
+            os.unlink(temp_file)
+
     @pytest.mark.asyncio
     async def test_edit_file_multiple_matches_error(self):
         """Test edit_file errors on multiple matches without replace_all."""
@@ -290,3 +545,140 @@ class TestToolExecution:
             assert result.details.get("error") == "old_string_not_found"
         finally:
             os.unlink(temp_file)
+
+    @pytest.mark.asyncio
+    async def test_edit_file_identical_replacement_skips_write(self):
+        """Test edit_file does not rewrite the file when nothing changes."""
+        tool = create_edit_file_tool()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.write("Hello World\n")
+            temp_file = f.name
+
+        try:
+            os.utime(temp_file, ns=(0, 0))
+
+            result = await tool.execute(
+                "call-1",
+                {
+                    "file_path": temp_file,
+                    "old_string": "Hello",
+                    "new_string": "Hello",
+                },
+                None,
+                None,
+            )
+
+            assert result.details.get("status") == "unchanged"
+            assert result.details.get("replacements") == 0
+            assert os.stat(temp_file).st_mtime_ns == 0
+        finally:
+            os.unlink(temp_file)
+
+    @pytest.mark.asyncio
+    async def test_edit_file_batch_edits(self):
+        tool = create_edit_file_tool()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.write("alpha beta\ngamma beta\n")
+            temp_file = f.name
+
+        try:
+            result = await tool.execute(
+                "call-1",
+                {
+                    "file_path": temp_file,
+                    "edits": [
+                        {"old_string": "alpha", "new_string": "ALPHA"},
+                        {"old_string": "beta", "new_string": "BETA", "replace_all": True},
+                    ],
+                },
+                None,
+                None,
+            )
+
+            assert result.details.get("replacements") == 3
+            with open(temp_file) as f:
+                assert f.read() == "ALPHA BETA\ngamma BETA\n"
+
+            result = await tool.execute(
+                "call-2",
+                {
+                    "file_path": temp_file,
+                    "edits": [
+                        {"old_string": "gamma", "new_string": "GAMMA"},
+                        {"old_string": "missing", "new_string": "x"},
+                    ],
+                },
+                None,
+                None,
+            )
+
+            assert result.details.get("error") == "old_string_not_found"
+            assert result.details.get("edit_index") == 1
+            with open(temp_file) as f:
+                assert f.read() == "ALPHA BETA\ngamma BETA\n"
+        finally:
+            os.unlink(temp_file)
+
+    @pytest.mark.asyncio
+    async def test_edit_file_large_file(self):
+        tool = create_edit_file_tool()
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.write("filler line\n" * 100_000 + "needle\n")
+            temp_file = f.name
+
+        try:
+            result = await tool.execute(
+                "call-1",
+                {"file_path": temp_file, "old_string": "missing", "new_string": "x"},
+                None,
+                None,
+            )
+            assert result.details.get("error") == "old_string_not_found"
+
+            result = await tool.execute(
+                "call-2",
+                {"file_path": temp_file, "old_string": "needle", "new_string": "found"},
+                None,
+                None,
+            )
+            assert result.details.get("replacements") == 1
+            with open(temp_file) as f:
+                assert f.read().endswith("filler line\nfound\n")
+        finally:
+            os.unlink(temp_file)
+
+    @pytest.mark.asyncio
+    async def test_edit_file_ascii_edit_keeps_utf8_content(self):
+        tool = create_edit_file_tool()
+
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as f:
+            f.write("naïve = 1\nname = 'café'\n".encode())
+            temp_file = f.name
+
+        try:
+            result = await tool.execute(
+                "call-1",
+                {"file_path": temp_file, "old_string": "name", "new_string": "label"},
+                None,
+                None,
+            )
+            assert result.details.get("replacements") == 1
+            with open(temp_file, "rb") as f:
+                assert f.read() == "naïve = 1\nlabel = 'café'\n".encode()
+
+            with open(temp_file, "wb") as f:
+                f.write(b"a = 1\r\nb = 2\r\n")
+            result = await tool.execute(
+                "call-2",
+                {"file_path": temp_file, "old_string": "b = 2", "new_string": "b = 3"},
+                None,
+                None,
+            )
+            assert result.details.get("replacements") == 1
+            with open(temp_file, "rb") as f:
+                assert f.read() == b"a = 1\nb = 3\n"
+        finally:
+            os.unlink(temp_file)
@@ -2,26 +2,38 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Final
 
-_PROVIDER_ENV_MAP: dict[str, str] = {
-    "openai": "OPENAI_API_KEY",
-    "azure-openai-responses": "AZURE_OPENAI_API_KEY",
-    "google": "GEMINI_API_KEY",
-    "groq": "GROQ_API_KEY",
-    "cerebras": "CEREBRAS_API_KEY",
-    "xai": "XAI_API_KEY",
-    "openrouter": "OPENROUTER_API_KEY",
-    "vercel-ai-gateway": "AI_GATEWAY_API_KEY",
-    "zai": "ZAI_API_KEY",
-    "mistral": "MISTRAL_API_KEY",
-    "minimax": "MINIMAX_API_KEY",
-    "minimax-cn": "MINIMAX_CN_API_KEY",
-    "huggingface": "HF_TOKEN",
-    "opencode": "OPENCODE_API_KEY",
-    "kimi-coding": "KIMI_API_KEY",
-    "zhipu": "ZHIPU_API_KEY",
+# Environment variables holding each provider's key, in order of preference
+_PROVIDER_ENV_VARS: Final[dict[str, tuple[str, ...]]] = {
+    "github-copilot": ("COPILOT_GITHUB_TOKEN", "GH_TOKEN", "GITHUB_TOKEN"),
+    "anthropic": ("ANTHROPIC_OAUTH_TOKEN", "ANTHROPIC_API_KEY"),
+    "openai": ("OPENAI_API_KEY",),
+    "azure-openai-responses": ("AZURE_OPENAI_API_KEY",),
+    "google": ("GEMINI_API_KEY",),
+    "groq": ("GROQ_API_KEY",),
+    "cerebras": ("CEREBRAS_API_KEY",),
+    "xai": ("XAI_API_KEY",),
+    "openrouter": ("OPENROUTER_API_KEY",),
+    "vercel-ai-gateway": ("AI_GATEWAY_API_KEY",),
+    "zai": ("ZAI_API_KEY",),
+    "mistral": ("MISTRAL_API_KEY",),
+    "minimax": ("MINIMAX_API_KEY",),
+    "minimax-cn": ("MINIMAX_CN_API_KEY",),
+    "huggingface": ("HF_TOKEN",),
+    "opencode": ("OPENCODE_API_KEY",),
+    "kimi-coding": ("KIMI_API_KEY",),
+    "zhipu": ("ZHIPU_API_KEY",),
 }
 
+_BEDROCK_ENV_VARS: Final = (
+    "AWS_PROFILE",
+    "AWS_BEARER_TOKEN_BEDROCK",
+    "AWS_CONTAINER_CREDENTIALS_RELATIVE_URI",
+    "AWS_CONTAINER_CREDENTIALS_FULL_URI",
+    "AWS_WEB_IDENTITY_TOKEN_FILE",
+)
+
 
 def _has_vertex_adc_credentials() -> bool:
     gac_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
@@ -32,15 +44,16 @@ def _has_vertex_adc_credentials() -> bool:
 
 
 def get_env_api_key(provider: str) -> str | None:
-    if provider == "github-copilot":
-        return (
-            os.environ.get("COPILOT_GITHUB_TOKEN")
-            or os.environ.get("GH_TOKEN")
-            or os.environ.get("GITHUB_TOKEN")
-        )
-
-    if provider == "anthropic":
-        return os.environ.get("ANTHROPIC_OAUTH_TOKEN") or os.environ.get("ANTHROPIC_API_KEY")
+    # Only the provider -> variable names table is static; the environment is
+    # read on every call so rotated or unset keys take effect immediately
+    env_vars = _PROVIDER_ENV_VARS.get(provider)
+    if env_vars:
+        value = None
+        for env_var in env_vars:
+            value = os.environ.get(env_var)
+            if value:
+                break
+        return value
 
     if provider == "google-vertex":
         has_credentials = _has_vertex_adc_credentials()
@@ -52,21 +65,10 @@ def get_env_api_key(provider: str) -> str | None:
             return "<authenticated>"
         return None
 
-    if provider == "amazon-bedrock":
-        if any(
-            os.environ.get(var)
-            for var in [
-                "AWS_PROFILE",
-                "AWS_BEARER_TOKEN_BEDROCK",
-                "AWS_CONTAINER_CREDENTIALS_RELATIVE_URI",
-                "AWS_CONTAINER_CREDENTIALS_FULL_URI",
-                "AWS_WEB_IDENTITY_TOKEN_FILE",
-            ]
-        ) or (os.environ.get("AWS_ACCESS_KEY_ID") and os.environ.get("AWS_SECRET_ACCESS_KEY")):
-            return "<authenticated>"
-        return None
+    if provider == "amazon-bedrock" and (
+        any(os.environ.get(var) for var in _BEDROCK_ENV_VARS)
+        or (os.environ.get("AWS_ACCESS_KEY_ID") and os.environ.get("AWS_SECRET_ACCESS_KEY"))
+    ):
+        return "<authenticated>"
 
-    env_var = _PROVIDER_ENV_MAP.get(provider)
-    if env_var:
-        return os.environ.get(env_var)
     return None
@@ -8,11 +8,32 @@ from __future__ import annotations
 
 import asyncio
 import random
+import re
 from collections.abc import Callable
 from typing import Any, TypeVar
 
 T = TypeVar("T")
 
+# HTTP-status-looking numbers in an error message
+_STATUS_RE = re.compile(r"\b([1-5]\d{2})\b")
+
+# Client errors that will not succeed on retry (429 rate limiting is retried)
+_NON_RETRY_STATUS = frozenset(range(400, 429))
+
+# Provider SDK exception class names for non-retryable client errors
+_NON_RETRY_TYPES = frozenset(
+    {
+        "AuthenticationError",
+        "PermissionDeniedError",
+        "NotFoundError",
+        "BadRequestError",
+        "UnprocessableEntityError",
+    }
+)
+
+# Auth / not-found / validation wording in error messages
+_NON_RETRY_TEXT_RE = re.compile(r"unauthorized|forbidden|not found|validation", re.IGNORECASE)
+
 
 class RetryError(Exception):
     """Raised when all retry attempts are exhausted."""
@@ -53,7 +74,11 @@ async def retry_with_backoff(
         Exception: Any non-transient exception from func
     """
     last_exception: Exception | None = None
-    delay = initial_delay_ms / 1000.0  # Convert to seconds
+    # Delay (in seconds) before the next attempt. It grows by multiplication
+    # and is capped at max_delay_ms, so a large max_attempts cannot overflow
+    # the way exponential_base ** attempt would
+    max_delay = max_delay_ms / 1000.0
+    next_delay = min(initial_delay_ms / 1000.0, max_delay)
 
     for attempt in range(max_attempts):
         try:
@@ -69,22 +94,16 @@ async def retry_with_backoff(
             if attempt == max_attempts - 1:
                 raise RetryError(e, attempt + 1)
 
-            # Calculate delay for next attempt
-            delay = min(
-                delay * exponential_base,
-                max_delay_ms / 1000.0,
-            )
+            delay = next_delay
+            next_delay = min(next_delay * exponential_base, max_delay)
 
             # Add jitter to avoid thundering herd
             if jitter:
-                delay = delay * (0.5 + random.random() * 0.5)
+                delay *= 0.5 + random.random() * 0.5
 
             # Wait before next attempt
             await asyncio.sleep(delay)
 
-            # Exponentially increase delay for next iteration
-            delay = delay * exponential_base
-
     # This should never be reached, but just in case
     raise RetryError(last_exception or Exception("Unknown error"), max_attempts)
 
@@ -107,34 +126,27 @@ def _should_not_retry(error: Exception) -> bool:
     - Network errors
     - Timeout errors
     """
-    error_str = str(error).lower()
-
-    # Authentication/authorization errors
-    if "401" in error_str or "unauthorized" in error_str:
-        return True
-    if "403" in error_str or "forbidden" in error_str:
+    if type(error).__name__ in _NON_RETRY_TYPES:
         return True
 
-    # Not found
-    if "404" in error_str or "not found" in error_str:
-        return True
+    # Prefer a structured status code (SDK errors, httpx.HTTPStatusError)
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in _NON_RETRY_STATUS
 
-    # Validation errors
-    if "400" in error_str or "validation" in error_str.lower():
-        return True
-    if "422" in error_str:
-        return True
+    # Match the message as-is rather than allocating a lowercased copy
+    error_str = str(error)
 
-    # Client errors (4xx)
-    # Note: 429 (rate limit) is an exception that should be retried
-    client_error_codes = ["400", "401", "403", "404", "405", "406", "407", "408", "409", "410", "411", "412", "413", "414", "415", "416", "417", "418", "419", "420", "421", "422", "423", "424", "425", "426", "427", "428"]
-    for code in client_error_codes:
-        if code in error_str:
-            return True
-    # 429 (rate limit) should be retried, so don't return True for it
+    # Authentication, not found and validation errors
+    if _NON_RETRY_TEXT_RE.search(error_str):
+        return True
 
-    # Network errors and server errors should be retried
-    return False
+    # Client errors (4xx) mentioned in the message
+    return any(
+        int(match.group(1)) in _NON_RETRY_STATUS for match in _STATUS_RE.finditer(error_str)
+    )
 
 
 def is_retryable_http_status(status_code: int) -> bool:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Callable
 from typing import Any
 
@@ -12,7 +13,17 @@ StreamFunction = Callable[
 ]
 
 ApiProvider = None
-_registry: dict[str, tuple[Any, str | None]] = {}
+
+# Copy-on-write: writers build a new (registry, providers) snapshot under the
+# lock and publish it with a single assignment, so readers never lock and never
+# see a registry and provider list from different updates.
+_snapshot: tuple[dict[str, tuple[Any, str | None]], tuple[Any, ...]] = ({}, ())
+_write_lock = threading.Lock()
+
+
+def _publish(registry: dict[str, tuple[Any, str | None]]) -> None:
+    global _snapshot
+    _snapshot = (registry, tuple(entry[0] for entry in registry.values()))
 
 
 def register_api_provider(
@@ -22,25 +33,25 @@ def register_api_provider(
     global ApiProvider
 
     ApiProvider = provider
-    _registry[provider.api] = (provider, source_id)
+    with _write_lock:
+        _publish({**_snapshot[0], provider.api: (provider, source_id)})
 
 
 def get_api_provider(api: str) -> Any | None:
-    entry = _registry.get(api)
+    entry = _snapshot[0].get(api)
     return entry[0] if entry else None
 
 
 def get_api_providers() -> list[Any]:
-    return [entry[0] for entry in _registry.values()]
+    # A fresh list each call: callers may sort or append to it freely
+    return list(_snapshot[1])
 
 
 def unregister_api_providers(source_id: str) -> None:
-    global ApiProvider
-    to_remove = [api for api, (_, sid) in _registry.items() if sid == source_id]
-    for api in to_remove:
-        del _registry[api]
+    with _write_lock:
+        _publish({api: entry for api, entry in _snapshot[0].items() if entry[1] != source_id})
 
 
 def clear_api_providers() -> None:
-    global ApiProvider
-    _registry.clear()
+    with _write_lock:
+        _publish({})
@@ -21,6 +21,13 @@ class TestEnvKeys:
         result = get_env_api_key("google")
         assert result == "test-gemini-key"
 
+    def test_get_env_api_key_prefers_first_set_variable(self, monkeypatch):
+        monkeypatch.delenv("COPILOT_GITHUB_TOKEN", raising=False)
+        monkeypatch.setenv("GH_TOKEN", "gh-token")
+        monkeypatch.setenv("GITHUB_TOKEN", "github-token")
+
+        assert get_env_api_key("github-copilot") == "gh-token"
+
     def test_get_env_api_key_missing(self, monkeypatch):
         monkeypatch.delenv("OPENAI_API_KEY", raising=False)
 
@@ -30,3 +37,13 @@ class TestEnvKeys:
     def test_get_env_api_key_unknown_provider(self):
         result = get_env_api_key("unknown-provider")
         assert result is None
+
+    def test_get_env_api_key_follows_environment_changes(self, monkeypatch):
+        monkeypatch.setenv("MISTRAL_API_KEY", "first")
+        assert get_env_api_key("mistral") == "first"
+
+        monkeypatch.setenv("MISTRAL_API_KEY", "second")
+        assert get_env_api_key("mistral") == "second"
+
+        monkeypatch.delenv("MISTRAL_API_KEY")
+        assert get_env_api_key("mistral") is None
@@ -66,3 +66,23 @@ class TestRegistry:
 
         providers = get_api_providers()
         assert len(providers) == 0
+
+    def test_providers_snapshot_is_stable(self):
+        clear_api_providers()
+        register_api_provider(MockApiProvider("snap-1", "Snap 1"))
+
+        snapshot = get_api_providers()
+        register_api_provider(MockApiProvider("snap-2", "Snap 2"))
+
+        assert [p.name for p in snapshot] == ["Snap 1"]
+        assert [p.name for p in get_api_providers()] == ["Snap 1", "Snap 2"]
+
+    def test_get_api_providers_returns_independent_list(self):
+        clear_api_providers()
+        register_api_provider(MockApiProvider("list-1", "List 1"))
+
+        providers = get_api_providers()
+        assert isinstance(providers, list)
+        providers.append(MockApiProvider("list-2", "List 2"))
+
+        assert [p.name for p in get_api_providers()] == ["List 1"]
@@ -0,0 +1,117 @@
+import pytest
+from pi_ai.providers import retry
+from pi_ai.providers.retry import RetryError, retry_with_backoff
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        recorded.append(delay)
+
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+class TestRetryWithBackoff:
+    @pytest.mark.asyncio
+    async def test_delays_grow_by_exponential_base(self, sleeps):
+        async def always_fails():
+            raise ConnectionError("connection reset")
+
+        with pytest.raises(RetryError) as exc_info:
+            await retry_with_backoff(
+                always_fails,
+                max_attempts=4,
+                initial_delay_ms=100,
+                exponential_base=2.0,
+                jitter=False,
+            )
+
+        assert exc_info.value.attempts == 4
+        assert sleeps == pytest.approx([0.1, 0.2, 0.4])
+
+    @pytest.mark.asyncio
+    async def test_delays_capped_at_max_delay(self, sleeps):
+        async def always_fails():
+            raise ConnectionError("connection reset")
+
+        with pytest.raises(RetryError):
+            await retry_with_backoff(
+                always_fails,
+                max_attempts=4,
+                initial_delay_ms=1000,
+                max_delay_ms=1500,
+                jitter=False,
+            )
+
+        assert sleeps == pytest.approx([1.0, 1.5, 1.5])
+
+    @pytest.mark.asyncio
+    async def test_large_max_attempts_does_not_overflow(self, sleeps):
+        async def always_fails():
+            raise ConnectionError("connection reset")
+
+        with pytest.raises(RetryError) as exc_info:
+            await retry_with_backoff(
+                always_fails,
+                max_attempts=2000,
+                initial_delay_ms=1000,
+                max_delay_ms=32000,
+                exponential_base=2.0,
+                jitter=False,
+            )
+
+        assert exc_info.value.attempts == 2000
+        assert sleeps[:7] == pytest.approx([1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 32.0])
+        assert sleeps[-1] == 32.0
+
+    @pytest.mark.asyncio
+    async def test_returns_after_transient_failure(self, sleeps):
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        assert await retry_with_backoff(flaky, jitter=False) == "ok"
+        assert calls == 2
+        assert len(sleeps) == 1
+
+
+class StatusError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TestShouldNotRetry:
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("Error code: 401 - invalid api key", True),
+            ("HTTP 422 Unprocessable Entity", True),
+            ("Error code: 429 - rate limited", False),
+            ("HTTP 503 Service Unavailable", False),
+            ("connection reset by peer", False),
+            ("request 14001 failed", False),
+            ("Resource Not Found", True),
+            ("Unauthorized", True),
+        ],
+    )
+    def test_status_in_message(self, message, expected):
+        assert retry._should_not_retry(Exception(message)) is expected
+
+    def test_structured_status_code_wins_over_message(self):
+        assert retry._should_not_retry(StatusError("upstream said 400", 503)) is False
+        assert retry._should_not_retry(StatusError("server overloaded", 403)) is True
+
+    def test_sdk_exception_type_name(self):
+        class AuthenticationError(Exception):
+            pass
+
+        assert retry._should_not_retry(AuthenticationError("bad key")) is True
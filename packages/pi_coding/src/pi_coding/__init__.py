@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 from typing import Any
 
@@ -125,41 +126,31 @@ __all__ = [
 ]
 
 
+# Tools only close over their cwd, so one set per directory can be shared
+# instead of rebuilding (and re-validating) the tool models on every call.
+@functools.lru_cache(maxsize=32)
+def _tool_set(kind: str, cwd: str) -> tuple:
+    factories = {
+        "coding": create_coding_tools,
+        "read_only": create_read_only_tools,
+        "all": create_all_tools,
+    }
+    return tuple(factories[kind](cwd))
+
+
 def get_coding_tools(cwd: str | None = None) -> list:
-    return create_coding_tools(cwd or os.getcwd())
+    return list(_tool_set("coding", cwd or os.getcwd()))
 
 
 def get_read_only_tools(cwd: str | None = None) -> list:
-    return create_read_only_tools(cwd or os.getcwd())
+    return list(_tool_set("read_only", cwd or os.getcwd()))
 
 
 def get_all_tools(cwd: str | None = None) -> list:
-    return create_all_tools(cwd or os.getcwd())
-
-
-class CodingAgentConfig:
-    def __init__(
-        self,
-        model: Any = None,
-        system_prompt: str | None = None,
-        working_dir: str | None = None,
-        tools: list | None = None,
-    ):
-        self.model = model
-        self.system_prompt = system_prompt
-        self.working_dir = working_dir
-        self.tools = tools
-
-
-def create_coding_agent(
-    config: CodingAgentConfig | None = None,
-    **kwargs: Any,
-) -> Agent:
-    cfg = config or CodingAgentConfig()
+    return list(_tool_set("all", cwd or os.getcwd()))
 
-    cwd = cfg.working_dir or os.getcwd()
 
-    system_prompt = cfg.system_prompt or """You are an expert coding assistant with access to file system tools.
+_DEFAULT_SYSTEM_PROMPT = """You are an expert coding assistant with access to file system tools.
 
 ## Core Principles
 
@@ -200,7 +191,32 @@ When asked to make code changes:
 - Be conservative with replacements
 - Provide clear, concise explanations"""
 
-    tools = cfg.tools or create_coding_tools(cwd)
+
+class CodingAgentConfig:
+    def __init__(
+        self,
+        model: Any = None,
+        system_prompt: str | None = None,
+        working_dir: str | None = None,
+        tools: list | None = None,
+    ):
+        self.model = model
+        self.system_prompt = system_prompt
+        self.working_dir = working_dir
+        self.tools = tools
+
+
+def create_coding_agent(
+    config: CodingAgentConfig | None = None,
+    **kwargs: Any,
+) -> Agent:
+    cfg = config or CodingAgentConfig()
+
+    cwd = cfg.working_dir or os.getcwd()
+
+    system_prompt = cfg.system_prompt or _DEFAULT_SYSTEM_PROMPT
+
+    tools = cfg.tools or get_coding_tools(cwd)
 
     agent = Agent(
         options={
@@ -11,7 +11,20 @@ from typing import Any
 from pi_agent import AgentTool, AgentToolResult
 from pi_ai.types import TextContent
 
-from pi_coding.utils import DEFAULT_MAX_BYTES, DEFAULT_MAX_LINES, format_size, truncate_tail
+from pi_coding.utils import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_LINES,
+    direct_argv,
+    format_size,
+    get_shell_env,
+    invalidate_git_cache,
+    kill_process_tree,
+    sanitize_binary_bytes,
+    truncate_tail,
+)
+
+# How long to keep reading output after killing a timed-out or aborted command
+_KILL_DRAIN_TIMEOUT = 1.0
 
 _BASH_TOOL_PARAMETERS = {
     "type": "object",
@@ -61,14 +74,30 @@ async def _execute_bash(
     total_bytes = 0
 
     try:
-        process = await asyncio.create_subprocess_shell(
-            command,
-            cwd=cwd,
-            shell=True,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
-            executable=shell,
-        )
+        # Same environment for direct and shell runs: the process env with the
+        # managed bin directory on PATH
+        env = get_shell_env()
+        spawn_options: dict[str, Any] = {
+            "cwd": cwd,
+            "env": env,
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.STDOUT,
+            # Own process group, so a timeout or abort can kill the whole tree
+            "start_new_session": os.name == "posix",
+        }
+
+        # A plain program invocation runs directly, saving the fork/exec of a
+        # wrapping shell. Anything the shell would interpret, or a program not
+        # on PATH, still goes through the shell.
+        argv = direct_argv(command, env)
+        if argv:
+            process = await asyncio.create_subprocess_exec(*argv, **spawn_options)
+        else:
+            process = await asyncio.create_subprocess_shell(
+                command,
+                executable=shell,
+                **spawn_options,
+            )
 
         async def read_stream():
             nonlocal total_bytes, chunks_bytes, temp_file, temp_file_path
@@ -104,7 +133,7 @@ async def _execute_bash(
 
                     if on_update:
                         full_buffer = b"".join(chunks)
-                        full_text = full_buffer.decode("utf-8", errors="replace")
+                        full_text = sanitize_binary_bytes(full_buffer)
                         truncation = truncate_tail(full_text)
                         on_update(
                             AgentToolResult(
@@ -121,18 +150,43 @@ async def _execute_bash(
 
         read_task = asyncio.create_task(read_stream())
 
-        try:
-            if timeout is not None and timeout > 0:
-                await asyncio.wait_for(process.wait(), timeout=timeout)
-            else:
-                await process.wait()
-        except asyncio.TimeoutError:
-            process.kill()
-            await process.wait()
-            if temp_file:
-                temp_file.close()
+        # Wait for exit, a timeout or an abort, whichever comes first
+        wait_task = asyncio.ensure_future(process.wait())
+        waiters: set[asyncio.Future[Any]] = {wait_task}
+        if cancel_event:
+            waiters.add(asyncio.ensure_future(cancel_event.wait()))
+        await asyncio.wait(
+            waiters,
+            timeout=timeout if timeout is not None and timeout > 0 else None,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for waiter in waiters - {wait_task}:
+            waiter.cancel()
+
+        timed_out = False
+        if not wait_task.done():
+            kill_process_tree(process.pid)
+            # A grandchild that called setsid escapes the group kill and can
+            # hold the pipe open indefinitely, which also keeps process.wait()
+            # pending. Give the output a moment to drain, then keep what was
+            # read and close our end of the pipe.
+            await asyncio.wait({read_task}, timeout=_KILL_DRAIN_TIMEOUT)
+            if not read_task.done():
+                read_task.cancel()
+                process._transport.close()  # type: ignore[attr-defined]
+            await wait_task
+            timed_out = not (cancel_event and cancel_event.is_set())
+
+        await read_task
+        # The command may have changed the working tree or switched branches
+        invalidate_git_cache()
+
+        if temp_file:
+            temp_file.close()
+
+        if timed_out:
             full_buffer = b"".join(chunks)
-            output = full_buffer.decode("utf-8", errors="replace")
+            output = sanitize_binary_bytes(full_buffer)
             return AgentToolResult(
                 content=[
                     TextContent(
@@ -143,21 +197,18 @@ async def _execute_bash(
                 details={"error": "timeout", "timeout": timeout, "command": command},
             )
 
-        await read_task
-
-        if temp_file:
-            temp_file.close()
-
         if cancel_event and cancel_event.is_set():
             full_buffer = b"".join(chunks)
-            output = full_buffer.decode("utf-8", errors="replace")
+            output = sanitize_binary_bytes(full_buffer)
             return AgentToolResult(
                 content=[TextContent(type="text", text=f"{output}\n\nCommand aborted")],
                 details={"error": "aborted", "command": command},
             )
 
         full_buffer = b"".join(chunks)
-        full_output = full_buffer.decode("utf-8", errors="replace")
+        # Control bytes from binary output would garble the terminal; the temp
+        # file keeps the raw bytes
+        full_output = sanitize_binary_bytes(full_buffer)
         truncation = truncate_tail(full_output)
         output_text = truncation.content or "(no output)"
 
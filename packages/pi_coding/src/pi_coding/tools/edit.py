@@ -14,6 +14,7 @@ from pi_coding.utils import (
     detect_line_ending,
     fuzzy_find_text,
     generate_diff_string,
+    invalidate_git_cache,
     normalize_for_fuzzy_match,
     normalize_to_lf,
     resolve_to_cwd,
@@ -41,6 +42,16 @@ _EDIT_TOOL_PARAMETERS = {
 }
 
 
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _write_file(path: str, content: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
 async def _execute_edit(
     tool_call_id: str,
     params: dict[str, Any],
@@ -77,8 +88,7 @@ async def _execute_edit(
                 details={"error": "file_not_found", "path": absolute_path},
             )
 
-        with open(absolute_path, encoding="utf-8") as f:
-            raw_content = f.read()
+        raw_content = await asyncio.to_thread(_read_file, absolute_path)
 
         if cancel_event and cancel_event.is_set():
             return AgentToolResult(
@@ -105,9 +115,18 @@ async def _execute_edit(
                 details={"error": "text_not_found", "path": absolute_path},
             )
 
-        fuzzy_content = normalize_for_fuzzy_match(normalized_content)
+        # Uniqueness is checked in fuzzy space. A fuzzy match already produced the
+        # normalized content, and only a second hit needs a full count.
+        if match_result.used_fuzzy_match:
+            fuzzy_content = match_result.content_for_replacement
+        else:
+            fuzzy_content = normalize_for_fuzzy_match(normalized_content)
         fuzzy_old_text = normalize_for_fuzzy_match(normalized_old_text)
-        occurrences = fuzzy_content.count(fuzzy_old_text)
+        first = fuzzy_content.find(fuzzy_old_text)
+        if first != -1 and fuzzy_content.find(fuzzy_old_text, first + len(fuzzy_old_text)) != -1:
+            occurrences = fuzzy_content.count(fuzzy_old_text)
+        else:
+            occurrences = 1
 
         if occurrences > 1:
             return AgentToolResult(
@@ -145,8 +164,8 @@ async def _execute_edit(
             )
 
         final_content = bom + restore_line_endings(new_content, original_ending)
-        with open(absolute_path, "w", encoding="utf-8") as f:
-            f.write(final_content)
+        await asyncio.to_thread(_write_file, absolute_path, final_content)
+        invalidate_git_cache()
 
         diff_result = generate_diff_string(base_content, new_content)
         return AgentToolResult(
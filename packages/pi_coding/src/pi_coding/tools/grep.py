@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import os
+import re
 import shutil
 from pi_agent.types import AgentToolUpdateCallback
 from typing import Any
@@ -23,6 +25,19 @@ from pi_coding.utils import (
 
 DEFAULT_LIMIT = 100
 
+# Output is read in chunks rather than lines: StreamReader.readline() fails on
+# lines longer than its 64 KiB buffer (minified or generated files)
+_READ_CHUNK = 64 * 1024
+
+# rg escapes that grep -E lacks: (replacement, replacement inside [...]).
+# Negated classes have no bracket form and are left alone there.
+_ERE_ESCAPES = {
+    "d": ("[0-9]", "0-9"),
+    "D": ("[^0-9]", None),
+    "s": ("[[:space:]]", "[:space:]"),
+    "S": ("[^[:space:]]", None),
+}
+
 _GREP_TOOL_PARAMETERS = {
     "type": "object",
     "properties": {
@@ -59,6 +74,134 @@ _GREP_TOOL_PARAMETERS = {
 }
 
 
+@functools.lru_cache(maxsize=1)
+def _find_rg() -> str | None:
+    return shutil.which("rg")
+
+
+@functools.lru_cache(maxsize=1)
+def _find_grep() -> str | None:
+    return shutil.which("grep")
+
+
+_RG_MATCH_PREFIX = b'{"type":"match"'
+
+
+def _parse_rg_line(line: bytes) -> tuple[str, Any] | None:
+    """Return ``(path, line_number)`` for an ``rg --json`` match event, else None."""
+    # rg writes compact JSON with "type" first, so begin/end/context/summary
+    # events are skipped without being decoded or parsed. json.loads takes the
+    # raw bytes, saving a separate decode of every match line.
+    if not line.startswith(_RG_MATCH_PREFIX):
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if event.get("type") != "match":
+        return None
+    data = event.get("data", {})
+    return data.get("path", {}).get("text", ""), data.get("line_number")
+
+
+def _parse_grep_line(line: bytes) -> tuple[str, Any] | None:
+    """Return ``(path, line_number)`` for a ``grep -nHZ`` output line, else None."""
+    # -Z terminates the file name with NUL, so paths containing ':' parse fine
+    path, sep, rest = line.partition(b"\0")
+    if not sep:
+        return None
+    number, sep, _ = rest.partition(b":")
+    if not sep or not number.isdigit():
+        return None
+    return os.fsdecode(path), int(number)
+
+
+def _rg_pattern_to_ere(pattern: str) -> tuple[str, bool]:
+    """Translate the common rg regex syntax that ``grep -E`` does not know.
+
+    Returns the pattern and whether it asked for case-insensitive matching via
+    a leading ``(?i)``. Only ``\\d``, ``\\s`` and their negations are rewritten;
+    everything else is passed through and matched with POSIX ERE semantics.
+    """
+    ignore_case = pattern.startswith("(?i)")
+    if ignore_case:
+        pattern = pattern[4:]
+
+    out: list[str] = []
+    in_bracket = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escape = _ERE_ESCAPES.get(pattern[i + 1])
+            replacement = escape[in_bracket] if escape else None
+            out.append(replacement or pattern[i : i + 2])
+            i += 2
+            continue
+        if in_bracket:
+            in_bracket = char != "]"
+        elif char == "[":
+            in_bracket = True
+            # A ']' first in the set (after an optional '^') is a literal member
+            end = i + 1
+            if pattern.startswith("^", end):
+                end += 1
+            if pattern.startswith("]", end):
+                end += 1
+            out.append(pattern[i:end])
+            i = end
+            continue
+        out.append(char)
+        i += 1
+    return "".join(out), ignore_case
+
+
+def _compile_glob(glob: str) -> re.Pattern[str]:
+    """Compile a glob the way rg applies it.
+
+    ``*`` and ``?`` stay within one path component, ``**`` crosses directories
+    and ``{a,b}`` is an alternation. The pattern is matched against the path
+    relative to the search directory when it contains a ``/``, otherwise
+    against the file name.
+    """
+    parts: list[str] = []
+    depth = 0
+    i = 0
+    glob = glob.lstrip("/")
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        else:
+            char = glob[i]
+            i += 1
+            if char == "*":
+                parts.append("[^/]*")
+            elif char == "?":
+                parts.append("[^/]")
+            elif char == "[" and "]" in glob[i + 1 :]:
+                end = glob.index("]", i + 1)
+                members = glob[i:end]
+                if members.startswith("!"):
+                    members = "^" + members[1:]
+                parts.append("[" + members.replace("\\", "\\\\") + "]")
+                i = end + 1
+            elif char == "{":
+                parts.append("(?:")
+                depth += 1
+            elif char == "}" and depth:
+                parts.append(")")
+                depth -= 1
+            elif char == "," and depth:
+                parts.append("|")
+            else:
+                parts.append(re.escape(char))
+    return re.compile("".join(parts) + ")" * depth)
+
+
 async def _execute_grep(
     tool_call_id: str,
     params: dict[str, Any],
@@ -80,10 +223,13 @@ async def _execute_grep(
             details={"error": "missing_parameter"},
         )
 
-    rg_path = shutil.which("rg")
-    if not rg_path:
+    rg_path = _find_rg()
+    grep_path = None if rg_path else _find_grep()
+    if not rg_path and not grep_path:
         return AgentToolResult(
-            content=[TextContent(type="text", text="Error: ripgrep (rg) is not available")],
+            content=[
+                TextContent(type="text", text="Error: neither ripgrep (rg) nor grep is available")
+            ],
             details={"error": "rg_not_found"},
         )
 
@@ -109,18 +255,54 @@ async def _execute_grep(
                 pass
         return os.path.basename(file_path)
 
-    args = [rg_path, "--json", "--line-number", "--color=never", "--hidden"]
+    if rg_path:
+        args = [rg_path, "--json", "--line-number", "--color=never", "--hidden"]
 
-    if ignore_case:
-        args.append("--ignore-case")
+        if ignore_case:
+            args.append("--ignore-case")
+
+        if literal:
+            args.append("--fixed-strings")
+
+        if glob_pattern:
+            args.extend(["--glob", glob_pattern])
 
-    if literal:
-        args.append("--fixed-strings")
+        args.extend([pattern, search_path])
+        parse_line = _parse_rg_line
+        glob_filter = None
+    else:
+        # Plain grep fallback: no .gitignore support, and the pattern is
+        # matched as POSIX ERE after translating the common rg escapes
+        args = [grep_path, "-rnHZ", "--color=never", "--exclude-dir=.git"]
 
-    if glob_pattern:
-        args.extend(["--glob", glob_pattern])
+        grep_pattern = pattern
+        if not literal:
+            grep_pattern, inline_ignore_case = _rg_pattern_to_ere(pattern)
+            ignore_case = ignore_case or inline_ignore_case
 
-    args.extend([pattern, search_path])
+        if ignore_case:
+            args.append("-i")
+
+        args.append("-F" if literal else "-E")
+
+        # --include only sees file names, so the glob itself is applied to the
+        # matches below; the file name part still narrows what grep reads
+        glob_filter = None
+        if glob_pattern:
+            glob_filter = _compile_glob(glob_pattern)
+            if "{" not in glob_pattern:
+                args.append(f"--include={os.path.basename(glob_pattern)}")
+
+        args.extend(["-e", grep_pattern, search_path])
+        parse_line = _parse_grep_line
+
+    def glob_matches(file_path: str) -> bool:
+        if glob_filter is None or not is_directory:
+            return True
+        relative = format_path(file_path)
+        if "/" not in glob_pattern.strip("/"):
+            relative = relative.rsplit("/", 1)[-1]
+        return glob_filter.fullmatch(relative) is not None
 
     if cancel_event and cancel_event.is_set():
         return AgentToolResult(
@@ -132,7 +314,7 @@ async def _execute_grep(
         process = await asyncio.create_subprocess_exec(
             *args,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
 
         matches: list[tuple[str, int]] = []
@@ -179,40 +361,46 @@ async def _execute_grep(
 
         if process.stdout is None:
             return AgentToolResult(
-                content=[TextContent(type="text", text="Error: Failed to read ripgrep output")],
+                content=[TextContent(type="text", text="Error: Failed to read grep output")],
                 details={"error": "no_stdout"},
             )
 
-        while True:
+        pending = bytearray()
+        reading = True
+        while reading:
             try:
-                line = await process.stdout.readline()
-                if not line:
-                    break
+                chunk = await process.stdout.read(_READ_CHUNK)
+            except asyncio.CancelledError:
+                break
 
-                line_text = line.decode("utf-8", errors="replace").strip()
-                if not line_text or match_count >= effective_limit:
+            if not chunk:
+                # The last line may lack a trailing newline
+                lines = [bytes(pending)] if pending else []
+                reading = False
+            else:
+                pending += chunk
+                if b"\n" not in chunk:
                     continue
+                *lines, rest = bytes(pending).split(b"\n")
+                pending = bytearray(rest)
 
-                try:
-                    event = json.loads(line_text)
-                except json.JSONDecodeError:
+            for line in lines:
+                match = parse_line(line)
+                if match is None:
+                    continue
+                file_path, line_number = match
+                if not glob_matches(file_path):
                     continue
 
-                if event.get("type") == "match":
-                    match_count += 1
-                    file_path = event.get("data", {}).get("path", {}).get("text", "")
-                    line_number = event.get("data", {}).get("line_number")
-
-                    if file_path and isinstance(line_number, int):
-                        matches.append((file_path, line_number))
-
-                    if match_count >= effective_limit:
-                        match_limit_reached = True
-                        process.kill()
-                        break
+                match_count += 1
+                if file_path and isinstance(line_number, int):
+                    matches.append((file_path, line_number))
 
-            except asyncio.CancelledError:
-                break
+                if match_count >= effective_limit:
+                    match_limit_reached = True
+                    process.kill()
+                    reading = False
+                    break
 
         await process.wait()
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import os
 from pathlib import Path
 from pi_agent.types import AgentToolUpdateCallback
@@ -31,6 +32,27 @@ _LS_TOOL_PARAMETERS = {
 }
 
 
+def _list_entries(dir_path: str, limit: int) -> tuple[list[str], bool]:
+    """Return up to ``limit`` sorted names, directories suffixed with "/", and if more exist."""
+    # scandir yields the entry type from the directory read itself, so most
+    # entries need no extra stat() call to tell files from directories. Only
+    # the first limit + 1 entries are kept in order, rather than sorting a
+    # huge directory just to show its head; the extra one says more exist.
+    limit = max(int(limit), 0)
+    with os.scandir(dir_path) as it:
+        entries = heapq.nsmallest(limit + 1, it, key=lambda e: e.name.lower())
+
+    results: list[str] = []
+    for entry in entries[:limit]:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        results.append(entry.name + "/" if is_dir else entry.name)
+
+    return results, len(entries) > limit
+
+
 async def _execute_ls(
     tool_call_id: str,
     params: dict[str, Any],
@@ -49,38 +71,26 @@ async def _execute_ls(
 
     dir_path = resolve_to_cwd(path, cwd)
 
-    if not os.path.exists(dir_path):
+    # Let scandir report missing paths and non-directories instead of probing
+    # the path with separate stat() calls first
+    try:
+        results, entry_limit_reached = await asyncio.to_thread(_list_entries, dir_path, limit)
+    except FileNotFoundError:
         return AgentToolResult(
             content=[TextContent(type="text", text=f"Error: Path not found: {dir_path}")],
             details={"error": "path_not_found", "path": dir_path},
         )
-
-    if not os.path.isdir(dir_path):
+    except NotADirectoryError:
         return AgentToolResult(
             content=[TextContent(type="text", text=f"Error: Not a directory: {dir_path}")],
             details={"error": "not_a_directory", "path": dir_path},
         )
-
-    try:
-        entries = sorted(os.listdir(dir_path), key=lambda s: s.lower())
     except PermissionError as e:
         return AgentToolResult(
             content=[TextContent(type="text", text=f"Error: Cannot read directory: {e}")],
             details={"error": "permission_denied", "path": dir_path},
         )
 
-    results: list[str] = []
-    entry_limit_reached = False
-
-    for entry in entries:
-        if len(results) >= limit:
-            entry_limit_reached = True
-            break
-
-        full_path = os.path.join(dir_path, entry)
-        suffix = "/" if os.path.isdir(full_path) else ""
-        results.append(entry + suffix)
-
     if not results:
         return AgentToolResult(
             content=[TextContent(type="text", text="(empty directory)")],
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import dataclasses
+import math
 import os
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable
@@ -22,6 +24,8 @@ from pi_coding.utils import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from pi_coding.utils import TruncationOptions
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
@@ -39,6 +43,56 @@ def _detect_image_mime_type(path: str) -> str | None:
     return IMAGE_MIME_TYPES.get(ext)
 
 
+def _read_base64(path: str) -> str:
+    with open(path, "rb") as f:
+        return base64.standard_b64encode(f.read()).decode("utf-8")
+
+
+_READ_BUFFER_SIZE = 128 * 1024
+
+
+def _iter_lines(f: Iterable[str]) -> Iterator[str]:
+    """Yield lines without terminators, the same way splitting the text on newlines would."""
+    ends_with_newline = True
+    for line in f:
+        ends_with_newline = line.endswith("\n")
+        yield line[:-1] if ends_with_newline else line
+    if ends_with_newline:
+        yield ""
+
+
+def _read_lines(path: str, start: int, stop: float) -> tuple[list[str], int, int, int]:
+    """
+    Stream the lines in ``[start, stop)`` from ``path`` without loading the file.
+
+    Only as many selected lines as ``truncate_head`` can use are kept (one past
+    either default limit); the rest are just counted.
+
+    Returns the kept lines, the total number of lines in the file, and the line
+    and byte counts of the full selection.
+    """
+    kept: list[str] = []
+    kept_bytes = 0
+    selected_lines = 0
+    selected_bytes = 0
+    total_lines = 0
+
+    with open(path, encoding="utf-8", buffering=_READ_BUFFER_SIZE) as f:
+        for index, line in enumerate(_iter_lines(f)):
+            total_lines += 1
+            if index < start or index >= stop:
+                continue
+            if selected_lines:
+                selected_bytes += 1  # joining newline
+            selected_bytes += len(line) if line.isascii() else len(line.encode("utf-8"))
+            selected_lines += 1
+            if len(kept) <= DEFAULT_MAX_LINES and kept_bytes <= DEFAULT_MAX_BYTES:
+                kept.append(line)
+                kept_bytes = selected_bytes
+
+    return kept, total_lines, selected_lines, selected_bytes
+
+
 _READ_TOOL_PARAMETERS = {
     "type": "object",
     "properties": {
@@ -100,8 +154,7 @@ async def _execute_read(
 
     if mime_type:
         try:
-            with open(absolute_path, "rb") as f:
-                data = base64.standard_b64encode(f.read()).decode("utf-8")
+            data = await asyncio.to_thread(_read_base64, absolute_path)
             return AgentToolResult(
                 content=[
                     TextContent(type="text", text=f"Read image file [{mime_type}]"),
@@ -116,8 +169,13 @@ async def _execute_read(
             )
 
     try:
-        with open(absolute_path, encoding="utf-8") as f:
-            content = f.read()
+        start_line = max(0, (offset or 1) - 1)
+        start_line_display = start_line + 1
+        stop_line = start_line + limit if limit is not None else math.inf
+
+        lines, total_file_lines, selected_lines, selected_bytes = await asyncio.to_thread(
+            _read_lines, absolute_path, start_line, stop_line
+        )
 
         if cancel_event and cancel_event.is_set():
             return AgentToolResult(
@@ -125,12 +183,6 @@ async def _execute_read(
                 details={"error": "aborted"},
             )
 
-        all_lines = content.split("\n")
-        total_file_lines = len(all_lines)
-
-        start_line = max(0, (offset or 1) - 1)
-        start_line_display = start_line + 1
-
         if start_line >= total_file_lines:
             return AgentToolResult(
                 content=[
@@ -143,17 +195,19 @@ async def _execute_read(
             )
 
         if limit is not None:
-            end_line = min(start_line + limit, total_file_lines)
-            selected_content = "\n".join(all_lines[start_line:end_line])
-            user_limited_lines = end_line - start_line
+            user_limited_lines = min(start_line + limit, total_file_lines) - start_line
         else:
-            selected_content = "\n".join(all_lines[start_line:])
             user_limited_lines = None
 
-        truncation = truncate_head(selected_content)
+        # Totals describe the whole selection, not just the lines kept in memory
+        truncation = dataclasses.replace(
+            truncate_head("\n".join(lines)),
+            total_lines=selected_lines,
+            total_bytes=selected_bytes,
+        )
 
         if truncation.first_line_exceeds_limit:
-            first_line_size = format_size(len(all_lines[start_line].encode("utf-8")))
+            first_line_size = format_size(len(lines[0].encode("utf-8")))
             output_text = f"[Line {start_line_display} is {first_line_size}, exceeds {format_size(DEFAULT_MAX_BYTES)} limit. Use bash: sed -n '{start_line_display}p' {path} | head -c {DEFAULT_MAX_BYTES}]"
             return AgentToolResult(
                 content=[TextContent(type="text", text=output_text)],
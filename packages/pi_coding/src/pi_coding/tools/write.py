@@ -11,7 +11,7 @@ from typing import Any
 from pi_agent import AgentTool, AgentToolResult
 from pi_ai.types import TextContent
 
-from pi_coding.utils import resolve_read_path
+from pi_coding.utils import invalidate_git_cache, resolve_read_path
 
 _WRITE_TOOL_PARAMETERS = {
     "type": "object",
@@ -29,6 +29,24 @@ _WRITE_TOOL_PARAMETERS = {
 }
 
 
+_WRITE_CHUNK_SIZE = 128 * 1024
+
+
+def _write_file(path: str, content: str) -> int:
+    """Write ``content`` to ``path`` and return its line count.
+
+    Lines are counted chunk by chunk as each chunk is written, instead of in a
+    second pass over the whole content on the event loop afterwards.
+    """
+    lines = 1
+    with open(path, "w", encoding="utf-8") as f:
+        for start in range(0, len(content), _WRITE_CHUNK_SIZE):
+            chunk = content[start : start + _WRITE_CHUNK_SIZE]
+            f.write(chunk)
+            lines += chunk.count("\n")
+    return lines
+
+
 async def _execute_write(
     tool_call_id: str,
     params: dict[str, Any],
@@ -56,7 +74,7 @@ async def _execute_write(
         )
 
     try:
-        Path(absolute_path).parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(Path(absolute_path).parent.mkdir, parents=True, exist_ok=True)
 
         if cancel_event and cancel_event.is_set():
             return AgentToolResult(
@@ -64,10 +82,9 @@ async def _execute_write(
                 details={"error": "aborted"},
             )
 
-        with open(absolute_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        lines = await asyncio.to_thread(_write_file, absolute_path, content)
+        invalidate_git_cache()
 
-        lines = content.count("\n") + 1
         chars = len(content)
 
         return AgentToolResult(
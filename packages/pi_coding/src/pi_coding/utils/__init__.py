@@ -17,6 +17,7 @@ from pi_coding.utils.git import (
     GitSource,
     get_current_branch,
     get_repo_status,
+    invalidate_git_cache,
     parse_git_url,
 )
 from pi_coding.utils.path_utils import (
@@ -32,10 +33,13 @@ from pi_coding.utils.path_utils import (
     try_nfd_variant,
 )
 from pi_coding.utils.shell import (
+    direct_argv,
     get_shell_config,
     get_shell_env,
     kill_process_tree,
+    sanitize_binary_bytes,
     sanitize_binary_output,
+    should_bypass_shell,
 )
 from pi_coding.utils.truncate import (
     DEFAULT_MAX_BYTES,
@@ -64,6 +68,7 @@ __all__ = [
     "GitSource",
     "get_current_branch",
     "get_repo_status",
+    "invalidate_git_cache",
     "parse_git_url",
     "UNICODE_SPACES",
     "expand_path",
@@ -75,10 +80,13 @@ __all__ = [
     "try_curly_quote_variant",
     "try_macos_screenshot_path",
     "try_nfd_variant",
+    "direct_argv",
     "get_shell_config",
     "get_shell_env",
     "kill_process_tree",
+    "sanitize_binary_bytes",
     "sanitize_binary_output",
+    "should_bypass_shell",
     "DEFAULT_MAX_BYTES",
     "DEFAULT_MAX_LINES",
     "GREP_MAX_LINE_LENGTH",
@@ -179,6 +179,34 @@ def _diff_lines(old_content: str, new_content: str) -> list[_DiffPart]:
 # Public diff generation
 # ---------------------------------------------------------------------------
 
+def _split_lines(value: str) -> list[str]:
+    """Split a diff part into lines, dropping the empty tail after a final newline."""
+    raw = value.split("\n")
+    if raw and raw[-1] == "":
+        raw.pop()
+    return raw
+
+
+def _count_lines(value: str) -> int:
+    """Return ``len(_split_lines(value))`` without building the list."""
+    if not value:
+        return 0
+    return value.count("\n") + (0 if value.endswith("\n") else 1)
+
+
+def _head_lines(value: str, count: int) -> list[str]:
+    """Return the first ``count`` lines of a diff part."""
+    return value.split("\n", count)[:count]
+
+
+def _tail_lines(value: str, count: int) -> list[str]:
+    """Return the last ``count`` lines of a diff part."""
+    if count <= 0:
+        return []
+    body = value[:-1] if value.endswith("\n") else value
+    return body.rsplit("\n", count)[-count:]
+
+
 def generate_diff_string(
     old_content: str,
     new_content: str,
@@ -193,9 +221,7 @@ def generate_diff_string(
     parts = _diff_lines(old_content, new_content)
     output: list[str] = []
 
-    old_lines = old_content.split("\n")
-    new_lines = new_content.split("\n")
-    max_line_num = max(len(old_lines), len(new_lines))
+    max_line_num = max(old_content.count("\n"), new_content.count("\n")) + 1
     line_num_width = len(str(max_line_num))
 
     old_line_num = 1
@@ -204,17 +230,13 @@ def generate_diff_string(
     first_changed_line: Optional[int] = None
 
     for i, part in enumerate(parts):
-        raw = part.value.split("\n")
-        if raw and raw[-1] == "":
-            raw.pop()
-
         if part.added or part.removed:
             # Capture the first changed line (in the new file)
             if first_changed_line is None:
                 first_changed_line = new_line_num
 
             # Show the change
-            for line in raw:
+            for line in _split_lines(part.value):
                 if part.added:
                     line_num_str = str(new_line_num).rjust(line_num_width)
                     output.append(f"+{line_num_str} {line}")
@@ -225,26 +247,29 @@ def generate_diff_string(
                     old_line_num += 1
             last_was_change = True
         else:
-            # Context lines – only show a few before/after changes
+            # Context lines – only show a few before/after changes. Unchanged
+            # regions can be most of the file, so only the lines actually shown
+            # are split out; the rest are just counted.
             next_part_is_change = (
                 i < len(parts) - 1
                 and (parts[i + 1].added or parts[i + 1].removed)
             )
+            line_count = _count_lines(part.value)
 
             if last_was_change or next_part_is_change:
-                lines_to_show = list(raw)
                 skip_start = 0
                 skip_end = 0
 
                 if not last_was_change:
                     # Show only last N lines as leading context
-                    skip_start = max(0, len(raw) - context_lines)
-                    lines_to_show = raw[skip_start:]
-
-                if not next_part_is_change and len(lines_to_show) > context_lines:
+                    skip_start = max(0, line_count - context_lines)
+                    lines_to_show = _tail_lines(part.value, line_count - skip_start)
+                elif not next_part_is_change and line_count > context_lines:
                     # Show only first N lines as trailing context
-                    skip_end = len(lines_to_show) - context_lines
-                    lines_to_show = lines_to_show[:context_lines]
+                    skip_end = line_count - context_lines
+                    lines_to_show = _head_lines(part.value, context_lines)
+                else:
+                    lines_to_show = _split_lines(part.value)
 
                 # Add ellipsis if we skipped lines at start
                 if skip_start > 0:
@@ -265,8 +290,8 @@ def generate_diff_string(
                     new_line_num += skip_end
             else:
                 # Skip these context lines entirely
-                old_line_num += len(raw)
-                new_line_num += len(raw)
+                old_line_num += line_count
+                new_line_num += line_count
 
             last_was_change = False
 
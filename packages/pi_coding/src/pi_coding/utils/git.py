@@ -1,8 +1,46 @@
 from dataclasses import dataclass
+import os
 import subprocess
 import re
+import time
 from urllib.parse import urlparse
-from typing import Optional
+from collections.abc import Callable
+from typing import Any, Optional
+
+_SCP_RE = re.compile(r"^git@([^:]+):(.+)$")
+_PROTO_RE = re.compile(r"^(https?|ssh|git)://", re.I)
+_PROTOCOLS = ("https://", "http://", "ssh://", "git://")
+
+# The common URL shapes in one pass: SCP-like, protocol URL with a plain
+# lowercase host, and host/path shorthand, each with an optional @ref. Anything
+# unusual (ports, userinfo, query/fragment/";" even after the ref, stray "@" or
+# whitespace) does not match and goes through the general split_ref/urlparse
+# path instead.
+_GIT_URL_RE = re.compile(
+    r"(?:git@(?P<scp_host>[^:\s]+):(?P<scp_path>[^@\s]+)"
+    r"|(?P<proto>https?|ssh|git)://(?P<url_host>[a-z0-9.-]+)/(?P<url_path>[^/@?#;\s][^@?#;\s]*)"
+    r"|(?P<short_host>[^/:@\s]*\.[^/:@\s]*|localhost)/(?P<short_path>[^@:\s]+))"
+    r"(?:@(?P<ref>[^:@?#;\s]+))?"
+)
+
+# Branch/status lookups are repeated many times per agent turn; results are
+# reused for a short while instead of spawning git each time.
+GIT_CACHE_TTL = 2.0
+_git_cache: dict[tuple[str, str], tuple[float, Any]] = {}
+
+def _cached_git(name: str, cwd: str | None, compute: Callable[[], Any]) -> Any:
+    key = (name, cwd or os.getcwd())
+    now = time.monotonic()
+    entry = _git_cache.get(key)
+    if entry is not None and now - entry[0] < GIT_CACHE_TTL:
+        return entry[1]
+    value = compute()
+    _git_cache[key] = (now, value)
+    return value
+
+def invalidate_git_cache() -> None:
+    """Forget cached branch/status results, e.g. after the working tree changed."""
+    _git_cache.clear()
 
 @dataclass
 class GitSource:
@@ -17,7 +55,7 @@ class GitSource:
 def split_ref(url: str) -> dict:
     """Split a git URL into repo and ref parts."""
     # Handle SCP-like URLs: git@github.com:user/repo@ref
-    scp_match = re.match(r"^git@([^:]+):(.+)$", url)
+    scp_match = _SCP_RE.match(url)
     if scp_match:
         host = scp_match.group(1)
         path_with_maybe_ref = scp_match.group(2)
@@ -62,21 +100,66 @@ def split_ref(url: str) -> dict:
     
     return {"repo": url}
 
+def _match_git_url(url: str) -> tuple[str, str, str, str | None] | None:
+    """Split a common-shape git URL into (repo, host, path, ref) with one regex match."""
+    match = _GIT_URL_RE.fullmatch(url)
+    if not match:
+        return None
+
+    ref = match.group("ref")
+    if match.group("scp_host"):
+        host, path = match.group("scp_host", "scp_path")
+        repo = f"git@{host}:{path}" if ref else url
+    elif match.group("proto"):
+        proto, host, path = match.group("proto", "url_host", "url_path")
+        if ref:
+            path = path.rstrip("/")
+            repo = f"{proto}://{host}/{path}"
+        else:
+            repo = url
+    else:
+        host, path = match.group("short_host", "short_path")
+        repo = f"https://{host}/{path}"
+    return repo, host, path, ref
+
 def parse_generic_git_url(url: str) -> Optional[GitSource]:
     """Parse a git URL that doesn't match hosted patterns."""
+    matched = _match_git_url(url)
+    if matched:
+        repo, host, path, ref = matched
+    else:
+        parsed_url = _parse_git_url_slow(url)
+        if parsed_url is None:
+            return None
+        repo, host, path, ref = parsed_url
+
+    normalized_path = path.replace(".git", "").lstrip("/")
+    if not host or not normalized_path or len(normalized_path.split("/")) < 2:
+        return None
+
+    return GitSource(
+        repo=repo,
+        host=host,
+        path=normalized_path,
+        ref=ref,
+        pinned=bool(ref)
+    )
+
+def _parse_git_url_slow(url: str) -> tuple[str, str, str, str | None] | None:
+    """Split any git URL into (repo, host, path, ref) via split_ref and urlparse."""
     split = split_ref(url)
     repo_without_ref = split["repo"]
     ref = split.get("ref")
-    
+
     repo = repo_without_ref
     host = ""
     path = ""
 
-    scp_match = re.match(r"^git@([^:]+):(.+)$", repo_without_ref)
+    scp_match = _SCP_RE.match(repo_without_ref)
     if scp_match:
         host = scp_match.group(1)
         path = scp_match.group(2)
-    elif any(repo_without_ref.startswith(p) for p in ["https://", "http://", "ssh://", "git://"]):
+    elif repo_without_ref.startswith(_PROTOCOLS):
         try:
             parsed = urlparse(repo_without_ref)
             host = parsed.hostname or ""
@@ -91,17 +174,7 @@ def parse_generic_git_url(url: str) -> Optional[GitSource]:
             return None
         repo = f"https://{repo_without_ref}"
 
-    normalized_path = path.replace(".git", "").lstrip("/")
-    if not host or not normalized_path or len(normalized_path.split("/")) < 2:
-        return None
-
-    return GitSource(
-        repo=repo,
-        host=host,
-        path=normalized_path,
-        ref=ref,
-        pinned=bool(ref)
-    )
+    return repo, host, path, ref
 
 def parse_git_url(source: str) -> Optional[GitSource]:
     """
@@ -118,7 +191,7 @@ def parse_git_url(source: str) -> Optional[GitSource]:
     url = trimmed[4:].strip() if has_git_prefix else trimmed
 
     # Without git: prefix, only accept explicit protocol URLs or SCP-like
-    if not has_git_prefix and not re.match(r"^(https?|ssh|git)://", url, re.I) and not url.startswith("git@"):
+    if not has_git_prefix and not _PROTO_RE.match(url) and not url.startswith("git@"):
         return None
 
     # The TS implementation uses hosted-git-info which handles many shorthands.
@@ -130,32 +203,32 @@ def parse_git_url(source: str) -> Optional[GitSource]:
     return parse_generic_git_url(url)
 
 def get_current_branch(cwd: Optional[str] = None) -> Optional[str]:
-    """Get current git branch."""
+    """Get current git branch, or None outside a repo or on a detached HEAD."""
+    return _cached_git("branch", cwd, lambda: _get_current_branch(cwd))
+
+def _get_current_branch(cwd: str | None) -> str | None:
     try:
+        # A single process: symbolic-ref also resolves an unborn branch (which
+        # rev-parse cannot) and fails quietly when HEAD is detached
         result = subprocess.run(
-            ["git", "symbolic-ref", "--short", "HEAD"],
-            cwd=cwd,
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-            
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            ["git", "symbolic-ref", "--quiet", "--short", "HEAD"],
             cwd=cwd,
             capture_output=True,
-            text=True
+            text=True,
+            check=False
         )
         if result.returncode == 0:
-            return result.stdout.strip()
-            
+            return result.stdout.strip() or None
+
         return None
     except (subprocess.CalledProcessError, FileNotFoundError):
         return None
 
 def get_repo_status(cwd: Optional[str] = None) -> dict[str, bool]:
     """Get repo status."""
+    return dict(_cached_git("status", cwd, lambda: _get_repo_status(cwd)))
+
+def _get_repo_status(cwd: str | None) -> dict[str, bool]:
     try:
         result = subprocess.run(
             ["git", "status", "--porcelain"],
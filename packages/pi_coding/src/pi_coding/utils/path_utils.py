@@ -4,6 +4,7 @@ Handles macOS-specific filename quirks (NFD normalization, curly quotes,
 narrow no-break spaces in screenshot timestamps, etc.).
 """
 
+import functools
 import os
 import re
 import unicodedata
@@ -77,15 +78,27 @@ def expand_path(file_path: str) -> str:
     return normalized
 
 
+def _resolve_to_cwd(file_path: str, cwd: str) -> str:
+    expanded = expand_path(file_path)
+    if os.path.isabs(expanded):
+        return expanded
+    return os.path.normpath(os.path.join(cwd, expanded))
+
+
+# Tools resolve the same (path, cwd) pairs over and over (read -> edit -> read);
+# resolution is pure string work, so memoize it.
+_resolve_to_cwd_cached = functools.lru_cache(maxsize=512)(_resolve_to_cwd)
+
+
 def resolve_to_cwd(file_path: str, cwd: str) -> str:
     """Resolve *file_path* relative to *cwd*.
 
     Handles ``~`` expansion and absolute paths.
     """
-    expanded = expand_path(file_path)
-    if os.path.isabs(expanded):
-        return expanded
-    return os.path.normpath(os.path.join(cwd, expanded))
+    if "~" in file_path:
+        # Depends on the home directory, which may change at runtime
+        return _resolve_to_cwd(file_path, cwd)
+    return _resolve_to_cwd_cached(file_path, cwd)
 
 
 def resolve_read_path(file_path: str, cwd: str) -> str:
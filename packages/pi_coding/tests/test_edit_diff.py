@@ -109,6 +109,22 @@ class TestGenerateDiffString:
         assert result["diff"] == ""
         assert result["first_changed_line"] is None
 
+    def test_context_around_change_in_large_file(self):
+        old = "".join(f"line{i}\n" for i in range(1, 1001))
+        new = old.replace("line500\n", "changed\n")
+        result = generate_diff_string(old, new, context_lines=2)
+        assert result["diff"].split("\n") == [
+            "      ...",
+            "  498 line498",
+            "  499 line499",
+            "- 500 line500",
+            "+ 500 changed",
+            "  501 line501",
+            "  502 line502",
+            "      ...",
+        ]
+        assert result["first_changed_line"] == 500
+
     def test_add_line(self):
         old = "line1"
         new = "line1\nline2"
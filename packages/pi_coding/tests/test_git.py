@@ -1,7 +1,13 @@
 import os
 import subprocess
 import pytest
-from pi_coding.utils.git import parse_git_url, get_current_branch, get_repo_status, GitSource
+from pi_coding.utils.git import (
+    parse_git_url,
+    get_current_branch,
+    get_repo_status,
+    invalidate_git_cache,
+    GitSource,
+)
 
 def test_parse_git_url_https():
     source = parse_git_url("https://github.com/user/repo")
@@ -30,6 +36,39 @@ def test_parse_git_url_ssh_scp():
     assert source.ref is None
     assert source.pinned is False
 
+def test_parse_git_url_shorthand_and_scp_with_ref():
+    source = parse_git_url("git:github.com/user/repo@dev")
+    assert source is not None
+    assert source.repo == "https://github.com/user/repo"
+    assert source.ref == "dev"
+
+    source = parse_git_url("git@github.com:user/repo@v1")
+    assert source is not None
+    assert source.repo == "git@github.com:user/repo"
+    assert source.ref == "v1"
+
+def test_parse_git_url_with_port_and_user():
+    source = parse_git_url("ssh://git@example.com:2222/user/repo@main")
+    assert source is not None
+    assert source.host == "example.com"
+    assert source.path == "user/repo"
+    assert source.ref == "main"
+
+_GH = "https://github.com/user/repo"
+
+@pytest.mark.parametrize("url,repo,path,ref", [
+    (_GH + "@main?x=1", _GH + "?x=1", "user/repo", "main"),
+    (_GH + "@v1#frag", _GH + "#frag", "user/repo", "v1"),
+    (_GH + "@feature;x", _GH + ";x", "user/repo", "feature"),
+    ("https://host/a/b@#", "https://host/a/b@#", "a/b@", None),
+])
+def test_parse_git_url_ref_followed_by_url_suffix(url, repo, path, ref):
+    source = parse_git_url(url)
+    assert source is not None
+    assert source.repo == repo
+    assert source.path == path
+    assert source.ref == ref
+
 def test_parse_git_url_invalid():
     assert parse_git_url("not-a-url") is None
     assert parse_git_url("http://github.com/only-user") is None
@@ -73,6 +112,14 @@ def test_get_current_branch_in_repo(git_repo):
     branch = get_current_branch(str(git_repo))
     assert branch in ["master", "main"]
 
+def test_get_current_branch_detached_head(git_repo):
+    cwd = str(git_repo)
+    subprocess.run(
+        ["git", "commit", "--allow-empty", "-m", "init"], cwd=cwd, capture_output=True, check=True
+    )
+    subprocess.run(["git", "checkout", "--detach"], cwd=cwd, capture_output=True, check=True)
+    assert get_current_branch(cwd) is None
+
 def test_get_repo_status_clean(git_repo):
     # Need at least one commit for some git operations, but status works on empty repo
     status = get_repo_status(str(git_repo))
@@ -103,3 +150,12 @@ def test_get_repo_status_staged(git_repo):
     status = get_repo_status(str(git_repo))
     assert status["has_staged_changes"] is True
     assert status["is_clean"] is False
+
+def test_get_repo_status_cached_until_invalidated(git_repo):
+    assert get_repo_status(str(git_repo))["is_clean"] is True
+
+    (git_repo / "new.txt").write_text("new")
+    assert get_repo_status(str(git_repo))["is_clean"] is True
+
+    invalidate_git_cache()
+    assert get_repo_status(str(git_repo))["has_untracked_files"] is True
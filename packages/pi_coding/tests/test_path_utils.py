@@ -98,6 +98,17 @@ class TestResolveToCwd:
         result = resolve_to_cwd("/etc/passwd", "/home/user")
         assert result == "/etc/passwd"
 
+    def test_normalizes_dot_segments(self):
+        assert resolve_to_cwd("./src/../file.txt", "/home/user") == "/home/user/file.txt"
+        # Repeated calls hit the memoized result
+        assert resolve_to_cwd("./src/../file.txt", "/home/user") == "/home/user/file.txt"
+
+    def test_tilde_follows_home_changes(self, monkeypatch):
+        monkeypatch.setenv("HOME", "/first")
+        assert resolve_to_cwd("~/notes.txt", "/cwd") == "/first/notes.txt"
+        monkeypatch.setenv("HOME", "/second")
+        assert resolve_to_cwd("~/notes.txt", "/cwd") == "/second/notes.txt"
+
 
 class TestFileExists:
     def test_existing_file(self):
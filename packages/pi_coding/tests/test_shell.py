@@ -1,11 +1,16 @@
 import os
 import platform
+import subprocess
 from pathlib import Path
 from pi_coding.utils.shell import (
     get_shell_config,
     get_shell_env,
+    sanitize_binary_bytes,
     sanitize_binary_output,
+    should_bypass_shell,
+    direct_argv,
     kill_process_tree,
+    _kill_process_trees,
 )
 from pi_coding.config import get_bin_dir
 
@@ -29,6 +34,20 @@ def test_get_shell_env_includes_bin_dir():
             
     assert bin_dir in env[path_key]
 
+def test_get_shell_env_follows_path_changes(monkeypatch):
+    bin_dir = str(get_bin_dir())
+    monkeypatch.setenv("PATH", "/usr/bin")
+    assert get_shell_env()["PATH"] == os.pathsep.join([bin_dir, "/usr/bin"])
+
+    monkeypatch.setenv("PATH", os.pathsep.join(["/opt/bin", bin_dir]))
+    assert get_shell_env()["PATH"] == os.pathsep.join(["/opt/bin", bin_dir])
+
+    monkeypatch.delenv("PATH")
+    assert get_shell_env()["PATH"] == bin_dir
+
+    monkeypatch.setenv("PI_SHELL_ENV_TEST", "1")
+    assert get_shell_env()["PI_SHELL_ENV_TEST"] == "1"
+
 def test_sanitize_binary_output_removes_control_chars():
     # \x00 is null, \x1f is unit separator
     input_text = "hello\x00world\x1f!"
@@ -45,6 +64,62 @@ def test_sanitize_binary_output_removes_unicode_format_chars():
     expected = "textformat!"
     assert sanitize_binary_output(input_text) == expected
 
+def test_sanitize_binary_bytes_matches_text_sanitizer():
+    data = "héllo\x00 wörld\x1b[0m\ttab\r\n\ufff9x".encode()
+    assert sanitize_binary_bytes(data) == sanitize_binary_output(data.decode())
+    assert sanitize_binary_bytes(b"plain\x07 ascii\n") == "plain ascii\n"
+    assert sanitize_binary_bytes(b"bad \xff byte") == "bad \ufffd byte"
+
+def test_should_bypass_shell():
+    assert should_bypass_shell("ls -la src")
+    assert should_bypass_shell("git status --short")
+    assert not should_bypass_shell("")
+    assert not should_bypass_shell("ls | head")
+    assert not should_bypass_shell("echo $HOME")
+    assert not should_bypass_shell("echo 'quoted text'")
+    assert not should_bypass_shell("ls *.py")
+    assert not should_bypass_shell("cd src")
+    assert not should_bypass_shell("exit 1")
+    assert not should_bypass_shell("FOO=1 env")
+    assert not should_bypass_shell("ls\npwd")
+    assert should_bypass_shell("ls\t-la")
+
+def test_should_bypass_shell_only_splits_on_space_and_tab():
+    # The shell treats these as word characters; str.split() would not
+    for ws in ("\u00a0", "\x0b", "\x0c", "\x1c", "\x1f"):
+        assert not should_bypass_shell(f"ls{ws}-la")
+        assert direct_argv(f"ls{ws}-la") is None
+    assert direct_argv("ls \t -la")[1:] == ["-la"]
+
+def test_should_bypass_shell_keeps_builtins_in_the_shell():
+    for builtin in ("echo hi", "printf x", "test -d .", "pwd", "kill 1", "true", "false"):
+        assert not should_bypass_shell(builtin)
+
 def test_kill_process_tree_nonexistent_pid():
     # Should not raise any exception
     kill_process_tree(999999)
+
+def test_kill_process_trees_kills_every_tree():
+    processes = [
+        subprocess.Popen(["sleep", "5"], start_new_session=os.name == "posix")
+        for _ in range(2)
+    ]
+    _kill_process_trees(p.pid for p in processes)
+    for process in processes:
+        assert process.wait(timeout=2) != 0
+
+def test_kill_process_trees_empty():
+    _kill_process_trees([])
+
+def test_kill_process_trees_falls_back_to_kill(monkeypatch):
+    if platform.system() == "Windows":
+        return
+    killed = []
+
+    def deny_killpg(pgid, sig):
+        raise PermissionError
+
+    monkeypatch.setattr(os, "killpg", deny_killpg)
+    monkeypatch.setattr(os, "kill", lambda pid, sig: killed.append(pid))
+    _kill_process_trees([os.getpid()])
+    assert killed == [os.getpid()]
@@ -2,6 +2,7 @@
 
 import asyncio
 import os
+import shutil
 import tempfile
 
 import pytest
@@ -17,11 +18,13 @@ from pi_coding import (
     create_write_tool,
     edit_tool,
     find_tool,
+    get_coding_tools,
     grep_tool,
     ls_tool,
     read_tool,
     write_tool,
 )
+from pi_coding.config import get_bin_dir
 
 
 class TestToolCreation:
@@ -54,6 +57,14 @@ class TestToolCreation:
         tool = create_find_tool("/tmp")
         assert tool.name == "find"
 
+    def test_get_coding_tools_reuses_tools_per_cwd(self):
+        first = get_coding_tools("/tmp")
+        second = get_coding_tools("/tmp")
+        assert [t.name for t in first] == ["read", "bash", "edit", "write"]
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second, strict=True))
+        assert get_coding_tools("/")[0] is not first[0]
+
 
 class TestReadTool:
     @pytest.mark.asyncio
@@ -105,6 +116,32 @@ class TestReadTool:
             os.unlink(temp_path)
 
 
+    @pytest.mark.asyncio
+    async def test_read_large_file_truncates_and_counts_lines(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.write("".join(f"line{i}\n" for i in range(1, 5001)))
+            temp_path = f.name
+
+        try:
+            tool = create_read_tool(os.path.dirname(temp_path))
+            result = await tool.execute(
+                "test-id",
+                {"path": os.path.basename(temp_path), "offset": 10, "limit": 5},
+                None,
+                None,
+            )
+            assert result.content[0].text.startswith("line10\nline11")
+            assert "[4987 more lines in file. Use offset=15 to continue.]" in result.content[0].text
+            assert result.details["total_lines"] == 5001
+
+            result = await tool.execute(
+                "test-id", {"path": os.path.basename(temp_path)}, None, None
+            )
+            assert result.details["truncation"]["total_lines"] == 5001
+            assert result.details["truncation"]["output_lines"] == 2000
+        finally:
+            os.unlink(temp_path)
+
 class TestWriteTool:
     @pytest.mark.asyncio
     async def test_write_file(self):
@@ -121,6 +158,20 @@ class TestWriteTool:
             with open(os.path.join(d, "test.txt")) as f:
                 assert f.read() == "hello world"
 
+    @pytest.mark.asyncio
+    async def test_write_large_file_reports_lines(self):
+        content = "".join(f"line {i}\n" for i in range(50_000))
+        with tempfile.TemporaryDirectory() as d:
+            tool = create_write_tool(d)
+            result = await tool.execute(
+                "test-id", {"path": "big.txt", "content": content}, None, None
+            )
+            assert result.details["line_count"] == 50_001
+            assert result.details["char_count"] == len(content)
+
+            with open(os.path.join(d, "big.txt")) as f:
+                assert f.read() == content
+
     @pytest.mark.asyncio
     async def test_write_creates_directories(self):
         with tempfile.TemporaryDirectory() as d:
@@ -186,6 +237,29 @@ class TestEditTool:
             os.unlink(temp_path)
 
 
+    @pytest.mark.asyncio
+    async def test_edit_rejects_multiple_occurrences(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+            f.write("value = 1\nvalue = 1  \n")
+            temp_path = f.name
+
+        try:
+            tool = create_edit_tool(os.path.dirname(temp_path))
+            result = await tool.execute(
+                "test-id",
+                {
+                    "path": os.path.basename(temp_path),
+                    "old_text": "value = 1",
+                    "new_text": "value = 2",
+                },
+                None,
+                None,
+            )
+            assert result.details["error"] == "multiple_occurrences"
+            assert result.details["occurrences"] == 2
+        finally:
+            os.unlink(temp_path)
+
 class TestBashTool:
     @pytest.mark.asyncio
     async def test_echo_command(self):
@@ -209,6 +283,81 @@ class TestBashTool:
         )
         assert "1" in result.content[0].text or "error" in result.content[0].text.lower()
 
+    @pytest.mark.asyncio
+    async def test_output_control_bytes_are_stripped(self):
+        tool = create_bash_tool("/tmp")
+        result = await tool.execute(
+            "test-id", {"command": "printf 'a\\033[1mb\\000c\\tz\\n'"}, None, None
+        )
+        assert result.content[0].text == "a[1mbc\tz\n"
+
+    @pytest.mark.asyncio
+    async def test_plain_commands_run_without_shell_wrapper(self):
+        with tempfile.TemporaryDirectory() as d:
+            tool = create_bash_tool(d)
+            open(os.path.join(d, "f.txt"), "w").close()
+            result = await tool.execute("test-id", {"command": "ls"}, None, None)
+            assert result.content[0].text.strip() == "f.txt"
+
+            result = await tool.execute("test-id", {"command": "no-such-command-xyz"}, None, None)
+            assert result.details["exit_code"] == 127
+
+    @pytest.mark.asyncio
+    async def test_commands_get_bin_dir_on_path(self):
+        tool = create_bash_tool("/tmp")
+        bin_dir = str(get_bin_dir())
+        # printenv runs directly, echo through the shell
+        for command in ("printenv PATH", "echo \"$PATH\""):
+            result = await tool.execute("test-id", {"command": command}, None, None)
+            assert bin_dir in result.content[0].text.strip().split(os.pathsep)
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_child_processes(self):
+        tool = create_bash_tool("/tmp")
+        result = await asyncio.wait_for(
+            tool.execute(
+                "test-id",
+                {"command": "echo start; sleep 5; echo end", "timeout": 0.2},
+                None,
+                None,
+            ),
+            timeout=3,
+        )
+        assert result.details["error"] == "timeout"
+        assert "start" in result.content[0].text
+        assert "end" not in result.content[0].text
+
+    @pytest.mark.asyncio
+    async def test_timeout_with_detached_grandchild_returns(self):
+        if shutil.which("setsid") is None:
+            pytest.skip("setsid not available")
+        tool = create_bash_tool("/tmp")
+        result = await asyncio.wait_for(
+            tool.execute(
+                "test-id",
+                # The setsid child survives the group kill and keeps stdout open
+                {"command": "echo start; setsid sleep 5 & sleep 5", "timeout": 0.2},
+                None,
+                None,
+            ),
+            timeout=3,
+        )
+        assert result.details["error"] == "timeout"
+        assert "start" in result.content[0].text
+
+    @pytest.mark.asyncio
+    async def test_cancel_event_aborts_running_command(self):
+        tool = create_bash_tool("/tmp")
+        cancel_event = asyncio.Event()
+        task = asyncio.create_task(
+            tool.execute("test-id", {"command": "sleep 5"}, cancel_event, None)
+        )
+        await asyncio.sleep(0.1)
+        cancel_event.set()
+
+        result = await asyncio.wait_for(task, timeout=3)
+        assert result.details["error"] == "aborted"
+
 
 class TestLsTool:
     @pytest.mark.asyncio
@@ -228,6 +377,48 @@ class TestLsTool:
             assert "subdir/" in result.content[0].text
             assert "file.txt" in result.content[0].text
 
+    @pytest.mark.asyncio
+    async def test_list_directory_sorted_with_symlinked_dir(self):
+        with tempfile.TemporaryDirectory() as d:
+            os.makedirs(os.path.join(d, "Beta"))
+            with open(os.path.join(d, "alpha.txt"), "w") as f:
+                f.write("test")
+            os.symlink(os.path.join(d, "Beta"), os.path.join(d, "link"))
+
+            tool = create_ls_tool(d)
+            result = await tool.execute("test-id", {}, None, None)
+            assert result.content[0].text.split("\n") == ["alpha.txt", "Beta/", "link/"]
+
+    @pytest.mark.asyncio
+    async def test_list_directory_limit(self):
+        with tempfile.TemporaryDirectory() as d:
+            for name in ["e.txt", "B.txt", "d.txt", "a.txt", "C.txt"]:
+                with open(os.path.join(d, name), "w") as f:
+                    f.write("test")
+
+            tool = create_ls_tool(d)
+            result = await tool.execute("test-id", {"limit": 3}, None, None)
+            assert result.content[0].text.split("\n")[:3] == ["a.txt", "B.txt", "C.txt"]
+            assert result.details["entry_limit_reached"] == 3
+
+            result = await tool.execute("test-id", {"limit": 5}, None, None)
+            expected = ["a.txt", "B.txt", "C.txt", "d.txt", "e.txt"]
+            assert result.content[0].text.split("\n") == expected
+            assert result.details is None
+
+    @pytest.mark.asyncio
+    async def test_list_missing_path_and_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "file.txt"), "w") as f:
+                f.write("test")
+
+            tool = create_ls_tool(d)
+            result = await tool.execute("test-id", {"path": "missing"}, None, None)
+            assert result.details["error"] == "path_not_found"
+
+            result = await tool.execute("test-id", {"path": "file.txt"}, None, None)
+            assert result.details["error"] == "not_a_directory"
+
     @pytest.mark.asyncio
     async def test_list_empty_directory(self):
         with tempfile.TemporaryDirectory() as d:
@@ -244,9 +435,6 @@ class TestLsTool:
 class TestGrepTool:
     @pytest.mark.asyncio
     async def test_grep_search(self):
-        import shutil
-        if not shutil.which("rg"):
-            pytest.skip("ripgrep (rg) not available")
         with tempfile.TemporaryDirectory() as d:
             with open(os.path.join(d, "test.txt"), "w") as f:
                 f.write("hello world\nfoo bar\nhello again")
@@ -260,6 +448,104 @@ class TestGrepTool:
             )
             assert "hello" in result.content[0].text
 
+    @pytest.mark.asyncio
+    async def test_grep_search_reports_paths_and_lines(self):
+        with tempfile.TemporaryDirectory() as d:
+            os.makedirs(os.path.join(d, "sub"))
+            with open(os.path.join(d, "sub", "a:b.py"), "w") as f:
+                f.write("x = 1\nHELLO = 2\n")
+            with open(os.path.join(d, "notes.txt"), "w") as f:
+                f.write("hello\n")
+
+            tool = create_grep_tool(d)
+            result = await tool.execute(
+                "test-id",
+                {"pattern": "hello", "ignore_case": True, "glob": "*.py"},
+                None,
+                None,
+            )
+            assert result.content[0].text == "sub/a:b.py:2: HELLO = 2"
+
+    @pytest.mark.asyncio
+    async def test_grep_path_and_brace_globs(self):
+        with tempfile.TemporaryDirectory() as d:
+            for name in ("src/a.py", "src/sub/b.py", "lib/c.py", "src/d.txt", "src/e.md"):
+                os.makedirs(os.path.dirname(os.path.join(d, name)), exist_ok=True)
+                with open(os.path.join(d, name), "w") as f:
+                    f.write("needle\n")
+
+            tool = create_grep_tool(d)
+
+            async def grep_files(glob):
+                result = await tool.execute(
+                    "test-id", {"pattern": "needle", "glob": glob}, None, None
+                )
+                return sorted(line.split(":")[0] for line in result.content[0].text.splitlines())
+
+            assert await grep_files("src/*.py") == ["src/a.py"]
+            assert await grep_files("src/**/*.py") == ["src/a.py", "src/sub/b.py"]
+            assert await grep_files("*.{py,txt}") == [
+                "lib/c.py",
+                "src/a.py",
+                "src/d.txt",
+                "src/sub/b.py",
+            ]
+
+    @pytest.mark.asyncio
+    async def test_grep_rg_regex_syntax(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "a.txt"), "w") as f:
+                f.write("id 42\nid x\nID\t7\n")
+
+            tool = create_grep_tool(d)
+            result = await tool.execute("test-id", {"pattern": "(?i)id\\s\\d+"}, None, None)
+            assert result.content[0].text == "a.txt:1: id 42\na.txt:3: ID\t7"
+
+    @pytest.mark.asyncio
+    async def test_grep_matches_lines_over_64k(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "min.js"), "w") as f:
+                f.write("a" * 200_000 + "needle\nneedle again\n")
+
+            tool = create_grep_tool(d)
+            result = await tool.execute("test-id", {"pattern": "needle"}, None, None)
+            lines = result.content[0].text.split("\n")
+            assert lines[0].startswith("min.js:1: aaa")
+            assert lines[1] == "min.js:2: needle again"
+
+    @pytest.mark.asyncio
+    async def test_grep_without_rg_or_grep(self, monkeypatch):
+        import pi_coding.tools.grep as grep_module
+
+        monkeypatch.setattr(grep_module, "_find_rg", lambda: None)
+        monkeypatch.setattr(grep_module, "_find_grep", lambda: None)
+        result = await create_grep_tool("/tmp").execute(
+            "test-id", {"pattern": "x"}, None, None
+        )
+        assert "grep" in result.content[0].text.replace("ripgrep", "")
+
+    def test_rg_pattern_to_ere(self):
+        from pi_coding.tools.grep import _rg_pattern_to_ere
+
+        assert _rg_pattern_to_ere(r"\d+\s\S\D") == (
+            "[0-9]+[[:space:]][^[:space:]][^0-9]",
+            False,
+        )
+        assert _rg_pattern_to_ere(r"(?i)[\d\s_]\.x") == (r"[0-9[:space:]_]\.x", True)
+        assert _rg_pattern_to_ere(r"[]\d]\\d") == (r"[]0-9]\\d", False)
+
+    def test_parse_rg_json_events(self):
+        from pi_coding.tools.grep import _parse_rg_line
+
+        match = (
+            b'{"type":"match","data":{"path":{"text":"src/a.py"},'
+            b'"lines":{"text":"x\\n"},"line_number":7}}\n'
+        )
+        assert _parse_rg_line(match) == ("src/a.py", 7)
+        assert _parse_rg_line(b'{"type":"begin","data":{"path":{"text":"src/a.py"}}}\n') is None
+        assert _parse_rg_line(b'{"type":"match",broken\n') is None
+        assert _parse_rg_line(b"\n") is None
+
 
 class TestFindTool:
     @pytest.mark.asyncio
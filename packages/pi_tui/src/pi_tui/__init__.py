@@ -6,20 +6,12 @@ Python port of @mariozechner/pi-tui from the pi-mono monorepo.
 TypeScript Reference: _ts_reference/tui.ts, _ts_reference/index.ts
 """
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from pi_tui.component import Component, Focusable, is_focusable
-from pi_tui.components import (
-    Box,
-    CancellableLoader,
-    DefaultSelectListTheme,
-    Input,
-    Loader,
-    SelectItem,
-    SelectList,
-    Spacer,
-    Text,
-    TruncatedText,
-)
-from pi_tui.container import Container
 from pi_tui.keys import (
     Key,
     KeyEventType,
@@ -29,23 +21,90 @@ from pi_tui.keys import (
     matches_key,
     parse_key,
 )
-from pi_tui.stdin_buffer import StdinBuffer, StdinBufferOptions
-from pi_tui.terminal import ProcessTerminal, Terminal
-from pi_tui.tui import (
-    CURSOR_MARKER,
-    TUI,
-    OverlayAnchor,
-    OverlayHandle,
-    OverlayMargin,
-    OverlayOptions,
-    SizeValue,
-)
 from pi_tui.utils import (
     truncate_to_width,
     visible_width,
     wrap_text_with_ansi,
 )
 
+if TYPE_CHECKING:
+    from pi_tui.components import (
+        Box,
+        CancellableLoader,
+        DefaultSelectListTheme,
+        Input,
+        Loader,
+        SelectItem,
+        SelectList,
+        Spacer,
+        Text,
+        TruncatedText,
+    )
+    from pi_tui.container import Container
+    from pi_tui.stdin_buffer import StdinBuffer, StdinBufferOptions
+    from pi_tui.terminal import ProcessTerminal, Terminal
+    from pi_tui.tui import (
+        CURSOR_MARKER,
+        TUI,
+        OverlayAnchor,
+        OverlayHandle,
+        OverlayMargin,
+        OverlayOptions,
+        SizeValue,
+    )
+
+# The components, terminal and TUI modules pull in asyncio and friends, so they
+# are imported on first attribute access (PEP 562) rather than with the package.
+# Importers that only need keys or utils don't pay for them.
+_LAZY_ATTRS = {
+    **dict.fromkeys(
+        [
+            "Box",
+            "CancellableLoader",
+            "DefaultSelectListTheme",
+            "Input",
+            "Loader",
+            "SelectItem",
+            "SelectList",
+            "Spacer",
+            "Text",
+            "TruncatedText",
+        ],
+        "pi_tui.components",
+    ),
+    "Container": "pi_tui.container",
+    "StdinBuffer": "pi_tui.stdin_buffer",
+    "StdinBufferOptions": "pi_tui.stdin_buffer",
+    "ProcessTerminal": "pi_tui.terminal",
+    "Terminal": "pi_tui.terminal",
+    **dict.fromkeys(
+        [
+            "CURSOR_MARKER",
+            "TUI",
+            "OverlayAnchor",
+            "OverlayHandle",
+            "OverlayMargin",
+            "OverlayOptions",
+            "SizeValue",
+        ],
+        "pi_tui.tui",
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRS])
+
+
 __all__ = [
     "Component",
     "Focusable",
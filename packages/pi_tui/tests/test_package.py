@@ -0,0 +1,25 @@
+"""
+Tests for the pi_tui package exports.
+"""
+
+import pytest
+
+import pi_tui
+
+
+def test_all_exports_resolve():
+    for name in pi_tui.__all__:
+        assert getattr(pi_tui, name) is not None
+
+
+def test_lazy_export_is_same_object():
+    from pi_tui.tui import TUI
+
+    assert pi_tui.TUI is TUI
+    assert "TUI" in dir(pi_tui)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        pi_tui.NotAThing  # noqa: B018
+
@@ -1,26 +1,87 @@
 """Integration tests configuration and fixtures."""
 
+import asyncio
 import os
+import re
+import sys
 import tempfile
-import shutil
+from collections.abc import Awaitable, Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Generator
+from typing import Any
 
 import pytest
+import pytest_asyncio
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
+
+
+_ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
+
+# KEY=value lines; blank lines, comments and lines without "=" don't match
+_ENV_LINE_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*)=(.*)$", re.MULTILINE)
 
 
 def load_env_file() -> dict[str, str]:
     """Load environment variables from .env file."""
-    env_vars = {}
-    env_path = Path(__file__).parent.parent.parent / ".env"
-    if env_path.exists():
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    env_vars[key.strip()] = value.strip()
-    return env_vars
+    try:
+        content = _ENV_PATH.read_text()
+    except FileNotFoundError:
+        return {}
+    return {
+        match.group(1).strip(): match.group(2).strip()
+        for match in _ENV_LINE_RE.finditer(content)
+    }
+
+
+class _InlineExecutor(ThreadPoolExecutor):
+    """
+    Executor that runs each submitted call straight away on the calling thread.
+
+    The tools hand small file reads and writes to asyncio.to_thread; in tests
+    the hop to a worker thread costs more than the I/O itself.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+_USE_UVLOOP = uvloop is not None and sys.platform != "win32"
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create a test event loop (uvloop where installed) with an inline executor."""
+    loop = uvloop.new_event_loop() if _USE_UVLOOP else asyncio.new_event_loop()
+    loop.set_default_executor(_InlineExecutor())
+    return loop
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config: pytest.Config, item: pytest.Item):
+    """Run async tests on the loop built by _new_event_loop."""
+    return {"uvloop" if _USE_UVLOOP else "asyncio": _new_event_loop}
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def _warm_loop() -> None:
+    """Start the session event loop before the first async test needs it."""
+    await asyncio.sleep(0)
+
+
+@pytest.fixture(scope="session")
+def run_sync() -> Generator[Callable[[Awaitable[Any]], Any], None, None]:
+    """Run a coroutine to completion on one event loop shared by the session."""
+    loop = _new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
 
 
 @pytest.fixture(scope="session")
@@ -38,11 +99,10 @@ def zhipu_api_key(env_vars: dict[str, str]) -> str | None:
 @pytest.fixture
 def temp_dir() -> Generator[Path, None, None]:
     """Create a temporary directory for test files. Cleans up after test."""
-    dir_path = Path(tempfile.mkdtemp(prefix="pi_integration_test_"))
-    yield dir_path
-    # Cleanup
-    if dir_path.exists():
-        shutil.rmtree(dir_path, ignore_errors=True)
+    with tempfile.TemporaryDirectory(
+        prefix="pi_integration_test_", ignore_cleanup_errors=True
+    ) as dir_path:
+        yield Path(dir_path)
 
 
 @pytest.fixture
@@ -53,23 +113,3 @@ def temp_file(temp_dir: Path) -> Generator[Path, None, None]:
     yield file_path
     # Cleanup handled by temp_dir fixture
 
-
-# Track all created temp directories for cleanup
-_created_temp_dirs: list[Path] = []
-
-
-def pytest_sessionstart(session):
-    """Called at the start of the test session."""
-    global _created_temp_dirs
-    _created_temp_dirs = []
-
-
-def pytest_sessionfinish(session, exitstatus):
-    """Called at the end of the test session. Cleanup any remaining temp dirs."""
-    global _created_temp_dirs
-    for dir_path in _created_temp_dirs:
-        if dir_path.exists():
-            try:
-                shutil.rmtree(dir_path, ignore_errors=True)
-            except Exception:
-                pass
@@ -20,9 +20,9 @@ pytestmark = pytest.mark.skipif(
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def zhipu_model() -> Model:
-    """Create a Zhipu model for testing."""
+    """Create a Zhipu model for testing. Shared by all tests; don't mutate it."""
     return Model(
         id="glm-4-flash",
         name="GLM-4-Flash",
@@ -99,7 +99,7 @@ class TestAgentIntegration:
         assert len(agent._steering_queue) == 1
 
     @pytest.mark.skip(reason="Requires real API call, run manually")
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_agent_simple_turn(self, zhipu_model: Model):
         """Test a simple turn with the agent."""
         agent = Agent(
@@ -120,7 +120,7 @@ class TestAgentIntegration:
         assert len(received_events) >= 0
 
     @pytest.mark.skip(reason="Requires real API call, run manually")
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_agent_with_tool_calling(self, zhipu_model: Model, simple_tool: AgentTool):
         """Test agent with tool calling."""
         agent = Agent(
@@ -20,9 +20,9 @@ pytestmark = pytest.mark.skipif(
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def zhipu_model() -> Model:
-    """Create a Zhipu model for testing."""
+    """Create a Zhipu model for testing. Shared by all tests; don't mutate it."""
     return Model(
         id="glm-4-flash",
         name="GLM-4-Flash",
@@ -37,9 +37,9 @@ def zhipu_model() -> Model:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simple_context() -> Context:
-    """Create a simple context for testing."""
+    """Create a simple context for testing. Shared by the module; don't mutate it."""
     return Context(
         systemPrompt="You are a helpful assistant. Be brief.",
         messages=[
@@ -55,7 +55,7 @@ def simple_context() -> Context:
 class TestZhipuIntegration:
     """Integration tests for Zhipu API."""
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_zhipu_simple_completion(self, zhipu_model: Model, simple_context: Context):
         """Test basic completion with Zhipu API."""
         stream = stream_zhipu(zhipu_model, simple_context)
@@ -82,7 +82,7 @@ class TestZhipuIntegration:
         assert len(text_content) > 0, "No text content in response"
         assert len(text_content[0].text) > 0, "Empty text response"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_zhipu_streaming_deltas(self, zhipu_model: Model, simple_context: Context):
         """Test that streaming produces delta events."""
         stream = stream_zhipu(zhipu_model, simple_context)
@@ -100,7 +100,7 @@ class TestZhipuIntegration:
             for delta in delta_events:
                 assert hasattr(delta, "delta"), "Delta event missing delta attribute"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_zhipu_with_tools(self, zhipu_model: Model):
         """Test tool calling with Zhipu API."""
         from pi_ai.types import Tool
@@ -143,7 +143,7 @@ class TestZhipuIntegration:
         assert done_event is not None, "No done event received"
         assert done_event.message is not None
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_zhipu_usage_tracking(self, zhipu_model: Model, simple_context: Context):
         """Test that usage is tracked in responses."""
         stream = stream_zhipu(zhipu_model, simple_context)
@@ -3,7 +3,10 @@
 import os
 import asyncio
 import tempfile
+from collections.abc import Callable
 from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
 
 import pytest
 
@@ -29,57 +32,66 @@ from pi_coding.config import (
 )
 
 
+@pytest.fixture(scope="session")
+def _session_workspace_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create one root directory shared by every test workspace."""
+    return tmp_path_factory.mktemp("ws_root")
+
+
+def _tools_for(workspace: str) -> SimpleNamespace:
+    """Create the coding tools for a workspace directory."""
+    return SimpleNamespace(
+        read=create_read_tool(workspace),
+        write=create_write_tool(workspace),
+        edit=create_edit_tool(workspace),
+        bash=create_bash_tool(workspace),
+        ls=create_ls_tool(workspace),
+    )
+
+
 class TestCodingToolsIntegration:
     """Integration tests for coding tools."""
 
     @pytest.fixture
-    def temp_workspace(self, tmp_path: Path) -> Path:
+    def temp_workspace(self, _session_workspace_root: Path) -> Path:
         """Create a temporary workspace for testing."""
-        workspace = tmp_path / "workspace"
+        # A fresh subdirectory per test; pytest removes the root with the session
+        workspace = _session_workspace_root / f"ws_{uuid4().hex}"
         workspace.mkdir()
         return workspace
 
-    @pytest.mark.asyncio
-    async def test_write_and_read_tool(self, temp_workspace: Path):
+    def test_write_and_read_tool(self, temp_workspace: Path, run_sync: Callable):
         """Test write tool followed by read tool."""
-        write_tool = create_write_tool(str(temp_workspace))
-        read_tool = create_read_tool(str(temp_workspace))
+        tools = _tools_for(str(temp_workspace))
 
         # Write a file
-        write_result = await write_tool.execute(
+        write_result = run_sync(tools.write.execute(
             "test-call-1",
             {"path": "test.txt", "content": "Hello, Integration Test!"},
             None,
             None,
-        )
-        assert "Success" in write_result.content[0].text or "wrote" in write_result.content[0].text.lower()
+        ))
+        write_text = write_result.content[0].text
+        assert "Success" in write_text or "wrote" in write_text.lower()
 
         # Read it back
-        read_result = await read_tool.execute(
+        read_result = run_sync(tools.read.execute(
             "test-call-2",
             {"path": "test.txt"},
             None,
             None,
-        )
+        ))
         assert "Hello, Integration Test!" in read_result.content[0].text
 
-    @pytest.mark.asyncio
-    async def test_edit_tool(self, temp_workspace: Path):
+    def test_edit_tool(self, temp_workspace: Path, run_sync: Callable):
         """Test edit tool."""
-        write_tool = create_write_tool(str(temp_workspace))
-        edit_tool = create_edit_tool(str(temp_workspace))
-        read_tool = create_read_tool(str(temp_workspace))
+        tools = _tools_for(str(temp_workspace))
 
         # Write initial file
-        await write_tool.execute(
-            "test-call-1",
-            {"path": "edit_test.txt", "content": "Hello World"},
-            None,
-            None,
-        )
+        (temp_workspace / "edit_test.txt").write_text("Hello World")
 
         # Edit the file
-        edit_result = await edit_tool.execute(
+        edit_result = run_sync(tools.edit.execute(
             "test-call-2",
             {
                 "path": "edit_test.txt",
@@ -88,24 +100,25 @@ class TestCodingToolsIntegration:
             },
             None,
             None,
-        )
-        assert "Success" in edit_result.content[0].text or "replaced" in edit_result.content[0].text.lower()
+        ))
+        edit_text = edit_result.content[0].text
+        assert "Success" in edit_text or "replaced" in edit_text.lower()
 
         # Verify edit
-        read_result = await read_tool.execute(
+        read_result = run_sync(tools.read.execute(
             "test-call-3",
             {"path": "edit_test.txt"},
             None,
             None,
-        )
+        ))
         assert "Hello Integration" in read_result.content[0].text
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_bash_tool_echo(self, temp_workspace: Path):
         """Test bash tool with simple echo command."""
-        bash_tool = create_bash_tool(str(temp_workspace))
+        tools = _tools_for(str(temp_workspace))
 
-        result = await bash_tool.execute(
+        result = await tools.bash.execute(
             "test-call-1",
             {"command": "echo 'Hello from bash'"},
             None,
@@ -113,14 +126,13 @@ class TestCodingToolsIntegration:
         )
         assert "Hello from bash" in result.content[0].text
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_bash_tool_creates_file(self, temp_workspace: Path):
         """Test bash tool creating a file."""
-        bash_tool = create_bash_tool(str(temp_workspace))
-        read_tool = create_read_tool(str(temp_workspace))
+        tools = _tools_for(str(temp_workspace))
 
         # Create file via bash
-        await bash_tool.execute(
+        await tools.bash.execute(
             "test-call-1",
             {"command": "echo 'Created by bash' > bash_created.txt"},
             None,
@@ -128,7 +140,7 @@ class TestCodingToolsIntegration:
         )
 
         # Verify file exists
-        result = await read_tool.execute(
+        result = await tools.read.execute(
             "test-call-2",
             {"path": "bash_created.txt"},
             None,
@@ -136,100 +148,105 @@ class TestCodingToolsIntegration:
         )
         assert "Created by bash" in result.content[0].text
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_ls_tool(self, temp_workspace: Path):
         """Test ls tool."""
-        write_tool = create_write_tool(str(temp_workspace))
-        ls_tool = create_ls_tool(str(temp_workspace))
+        tools = _tools_for(str(temp_workspace))
 
-        # Create some files
-        await write_tool.execute(
-            "test-call-1",
-            {"path": "file1.txt", "content": "content1"},
-            None,
-            None,
-        )
-        await write_tool.execute(
-            "test-call-2",
-            {"path": "file2.txt", "content": "content2"},
-            None,
-            None,
-        )
+        # Create some files; write tool behaviour is covered elsewhere
+        files = {"file1.txt": "content1", "file2.txt": "content2"}
+        for name, body in files.items():
+            (temp_workspace / name).write_text(body)
 
-        # List directory
-        result = await ls_tool.execute("test-call-3", {}, None, None)
-        assert "file1.txt" in result.content[0].text
-        assert "file2.txt" in result.content[0].text
+        # List directory; the only tool call in this test
+        result = await tools.ls.execute("test-call-1", {}, None, None)
+        listing = result.content[0].text
+        for name in files:
+            assert name in listing
 
-    @pytest.mark.asyncio
-    async def test_tool_chain_write_read_edit(self, temp_workspace: Path):
+    def test_tool_chain_write_read_edit(self, temp_workspace: Path, run_sync: Callable):
         """Test a chain of tool operations."""
-        write_tool = create_write_tool(str(temp_workspace))
-        read_tool = create_read_tool(str(temp_workspace))
-        edit_tool = create_edit_tool(str(temp_workspace))
+        tools = _tools_for(str(temp_workspace))
 
         # Step 1: Write
-        await write_tool.execute(
+        run_sync(tools.write.execute(
             "step1",
             {"path": "chain.txt", "content": "Line 1\nLine 2\nLine 3"},
             None,
             None,
-        )
+        ))
 
-        # Step 2: Read
-        read_result = await read_tool.execute("step2", {"path": "chain.txt"}, None, None)
-        assert "Line 1" in read_result.content[0].text
-
-        # Step 3: Edit
-        await edit_tool.execute(
-            "step3",
+        # Step 2: Edit
+        run_sync(tools.edit.execute(
+            "step2",
             {"path": "chain.txt", "old_text": "Line 2", "new_text": "Modified Line 2"},
             None,
             None,
-        )
+        ))
+
+        # Step 3: Verify; this one read covers both the write and the edit
+        final_result = run_sync(tools.read.execute("step3", {"path": "chain.txt"}, None, None))
+        final_text = final_result.content[0].text
+        for expected in ("Line 1", "Modified Line 2", "Line 3"):
+            assert expected in final_text
+
+
+# Without a repository the git tests have nothing to check, so skip them
+# rather than spawn git
+_CWD = Path.cwd()
+_IN_REPO = any((path / ".git").exists() for path in (_CWD, *_CWD.parents))
+_requires_repo = pytest.mark.skipif(not _IN_REPO, reason="not in a git repository")
+
 
-        # Step 4: Verify
-        final_result = await read_tool.execute("step4", {"path": "chain.txt"}, None, None)
-        assert "Modified Line 2" in final_result.content[0].text
-        assert "Line 1" in final_result.content[0].text
-        assert "Line 3" in final_result.content[0].text
+@pytest.fixture(scope="session")
+def _cached_branch() -> str | None:
+    """Current git branch, looked up once per session."""
+    return get_current_branch()
 
 
+@pytest.fixture(scope="session")
+def _cached_status() -> dict:
+    """Git repo status, looked up once per session."""
+    return get_repo_status()
+
+
+# get_current_branch / get_repo_status depend on the working directory, so keep
+# these on one worker when running under pytest-xdist
+@pytest.mark.xdist_group("git_cwd")
 class TestGitUtilitiesIntegration:
     """Integration tests for git utilities."""
 
-    def test_parse_git_url_github(self):
-        """Test parsing GitHub URLs."""
-        result = parse_git_url("https://github.com/user/repo")
+    @pytest.mark.parametrize(
+        "url,expected_ref",
+        [
+            ("https://github.com/user/repo", None),
+            ("https://github.com/user/repo@v1.0.0", "v1.0.0"),
+            ("git@github.com:user/repo", None),
+        ],
+        ids=["github", "with_ref", "ssh"],
+    )
+    def test_parse_git_url(self, url: str, expected_ref: str | None):
+        """Test parsing GitHub HTTPS and SSH URLs, with and without a ref."""
+        result = parse_git_url(url)
         assert result is not None
         assert result.host == "github.com"
         assert result.path == "user/repo"
         assert result.type == "git"
+        assert result.ref == expected_ref
+        assert result.pinned is (expected_ref is not None)
 
-    def test_parse_git_url_with_ref(self):
-        """Test parsing git URL with ref."""
-        result = parse_git_url("https://github.com/user/repo@v1.0.0")
-        assert result is not None
-        assert result.ref == "v1.0.0"
-        assert result.pinned is True
-
-    def test_parse_git_url_ssh(self):
-        """Test parsing SSH git URL."""
-        result = parse_git_url("git@github.com:user/repo")
-        assert result is not None
-        assert result.host == "github.com"
-        assert result.path == "user/repo"
-
-    def test_get_current_branch(self):
+    @_requires_repo
+    def test_get_current_branch(self, _cached_branch: str | None):
         """Test getting current git branch."""
         # This should work in any git repo
-        branch = get_current_branch()
+        branch = _cached_branch
         # May be None if not in a git repo
         assert branch is None or isinstance(branch, str)
 
-    def test_get_repo_status(self):
+    @_requires_repo
+    def test_get_repo_status(self, _cached_status: dict):
         """Test getting repo status."""
-        status = get_repo_status()
+        status = _cached_status
         assert isinstance(status, dict)
         assert "has_unstaged_changes" in status
         assert "has_staged_changes" in status
@@ -248,23 +265,23 @@ class TestShellUtilitiesIntegration:
         assert len(shell) > 0
         assert "-c" in args
 
-    def test_sanitize_binary_output(self):
+    @pytest.mark.parametrize(
+        "text,removed,kept",
+        [
+            # Control characters are dropped
+            ("Hello\x00\x01\x02World", ["\x00", "\x01"], ["Hello", "World"]),
+            # Newlines and tabs survive
+            ("Line1\nLine2\tTabbed\rReturn", [], ["\n", "\t", "\r"]),
+        ],
+        ids=["control_chars", "preserves_newlines"],
+    )
+    def test_sanitize_binary_output(self, text: str, removed: list[str], kept: list[str]):
         """Test sanitizing binary output."""
-        # Test with control characters
-        dirty = "Hello\x00\x01\x02World"
-        clean = sanitize_binary_output(dirty)
-        assert "\x00" not in clean
-        assert "\x01" not in clean
-        assert "Hello" in clean
-        assert "World" in clean
-
-    def test_sanitize_preserves_newlines(self):
-        """Test that sanitization preserves newlines and tabs."""
-        text = "Line1\nLine2\tTabbed\rReturn"
         clean = sanitize_binary_output(text)
-        assert "\n" in clean
-        assert "\t" in clean
-        assert "\r" in clean
+        for char in removed:
+            assert char not in clean
+        for part in kept:
+            assert part in clean
 
 
 class TestConfigIntegration: